@@ -37,7 +37,13 @@ from models import (
     streak,
     verticle,
     leaderboardincentive,
-    reward_log
+    reward_log,
+    incentive_watermark,
+    pending_match,
+    job,
+    daily_sales_rollup,
+    wallet_ledger,
+    idempotency_key
 )
 
 
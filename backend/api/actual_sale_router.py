@@ -1,20 +1,12 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
+from db.database import get_db
 from schemas.actual_sale_schema import ActualSaleSubmit, ActualSaleOut
 from crud.actual_sale_crud import submit_actual_sale, get_sales_by_salesman_id
 from utils.security import get_current_user_role
 
 router = APIRouter()
 
-# DB Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.post("/upload-actual", response_model=ActualSaleOut)
 def upload_actual_sale(
     payload: ActualSaleSubmit,
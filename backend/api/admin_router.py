@@ -1,16 +1,21 @@
 # incentive-app/backend/api/admin_router.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from sqlalchemy.orm import Session
 from schemas.outlet_schema import OutletOut
 from crud.outlet_crud import get_all_outlets
-from db.database import SessionLocal
+from db.database import get_db
 from models.admin import Admin
 from crud.system_crud import get_status, mark_setup_complete
 from schemas.system_schema import SetupStatusOut
 from config import settings
 from services.reward_distributor import reward_top_salesman
+from services.job_queue import submit_job
+from services.catalog_cache import cache_stats
+from services.leaderboard_cache import leaderboard_cache_stats
+from services.principal_cache import principal_cache_stats
+from services.password_hasher import password_hasher
 from utils.security import (
     get_current_user_role,
     hash_password,
@@ -20,16 +25,6 @@ from crud.admin_crud import get_admin_by_phone
 router = APIRouter(tags=["Admin"])
 
 
-# -------------------------------
-# DB Dependency
-# -------------------------------
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # -------------------------------
 # 🔐 Secure Test Ping (Admin Only)
 # -------------------------------
@@ -93,14 +88,36 @@ def complete_setup(db: Session = Depends(get_db)):
     state = mark_setup_complete(db)
     return {"message": "Setup marked complete", "setup_complete": state.setup_complete}
 
+@router.get("/cache/stats")
+def view_cache_stats(admin=Depends(get_current_user_role("admin"))):
+    """
+    Admin: Size, version and hit/miss counters of the in-process caches.
+    """
+    return {
+        **cache_stats(),
+        "leaderboards": leaderboard_cache_stats(),
+        "principals": principal_cache_stats()
+    }
+
+@router.get("/password-hasher/stats")
+def view_password_hasher_stats(admin=Depends(get_current_user_role("admin"))):
+    """
+    Admin: Queue depth and timings of the bcrypt worker pool.
+    """
+    return password_hasher.stats()
+
 class RewardRequest(BaseModel):
     period: str
 
 @router.post("/reward")
-def trigger_leaderboard_reward(payload: RewardRequest, db: Session = Depends(get_db)):
+def trigger_leaderboard_reward(payload: RewardRequest, background: bool = Query(False), db: Session = Depends(get_db)):
     period = payload.period.lower()
     if period not in ["day", "week", "month"]:
         raise HTTPException(status_code=400, detail="Invalid period. Use 'day', 'week' or 'month'.")
 
+    if background:
+        job = submit_job(db, f"reward_{period}", lambda job_db, progress: reward_top_salesman(job_db, period))
+        return {"job_id": job.id, "status": job.status}
+
     result = reward_top_salesman(db, period)
     return {"message": result}
\ No newline at end of file
@@ -11,35 +11,31 @@ from crud.salesman_crud import (
     create_salesman,
     get_pending_salesmen,
     approve_salesman,
-    get_salesman_by_mobile,
 )
-from crud.admin_crud import get_admin_by_phone
-from utils.hash import verify_password
+from crud.auth_crud import get_login_account, update_password_hash
+from services.password_hasher import password_hasher
 from utils.security import (
     create_access_token,
     get_current_user_role,
+    token_claims,
 )
-from db.database import SessionLocal
+from db.database import get_db
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.async_database import get_async_db
 
 router = APIRouter()
 
-# Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ----------- Signup Route (Salesman Only) -----------
 @router.post("/signup", response_model=SalesmanOut)
-def signup(salesman: SalesmanCreate, db: Session = Depends(get_db)):
+async def signup(salesman: SalesmanCreate, db: AsyncSession = Depends(get_async_db)):
     try:
-        new_user = create_salesman(db, salesman)
+        password_hash = await password_hasher.hash(salesman.password)
+        new_user = await db.run_sync(create_salesman, salesman, password_hash)
         return new_user
     except ValueError as ve:
         raise HTTPException(status_code=400, detail=str(ve))
+    except HTTPException:
+        raise
     except Exception as e:
         print("🚨 Signup failed:", str(e))
         raise HTTPException(status_code=500, detail=f"Signup failed: {str(e)}")
@@ -79,11 +75,21 @@ class TokenResponse(BaseModel):
 
 
 @router.post("/login", response_model=TokenResponse)
-def login(payload: LoginPayload, db: Session = Depends(get_db)):
-    # Try admin first
-    admin = get_admin_by_phone(db, payload.mobile)
-    if admin and verify_password(payload.password, admin.hashed_password):
-        token = create_access_token({"sub": admin.mobile, "role": "admin"})
+async def login(payload: LoginPayload, db: AsyncSession = Depends(get_async_db)):
+    # One lookup across admins and salesmen, then exactly one bcrypt verify
+    user = await db.run_sync(get_login_account, payload.mobile)
+    if not user or not user.password_hash:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    valid, new_hash = await password_hasher.verify_and_update(payload.password, user.password_hash)
+    if not valid:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    if new_hash:
+        # BCRYPT_ROUNDS changed since this password was set
+        await db.run_sync(update_password_hash, user.role, user.id, new_hash)
+
+    if user.role == "admin":
+        token = create_access_token(token_claims(user, "admin"))
         return {
             "access_token": token,
             "token_type": "bearer",
@@ -91,15 +97,10 @@ def login(payload: LoginPayload, db: Session = Depends(get_db)):
             "id": None
         }
 
-    # Fallback to salesman
-    user = get_salesman_by_mobile(db, payload.mobile)
-    if not user or not user.password or not verify_password(payload.password, user.password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
     if not user.is_approved:
         raise HTTPException(status_code=403, detail="Your account is pending admin approval.")
 
-    token = create_access_token({"sub": user.mobile, "role": "salesman", "id": user.id})
+    token = create_access_token(token_claims(user, "salesman", id=user.id))
     return {
         "access_token": token,
         "token_type": "bearer",
@@ -1,18 +1,25 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Response
+from typing import Optional
 from sqlalchemy.orm import Session
+from sqlalchemy import func
 from db.database import get_db
-from schemas.claim_schema import ClaimRequest, ClaimOut, ClaimUpdateRequest, ClaimAmendApproveRequest
+from schemas.claim_schema import (
+    ClaimRequest, ClaimOut, ClaimUpdateRequest, ClaimAmendApproveRequest,
+    BulkApproveRequest, BulkRejectRequest, BulkClaimResponse,
+)
 from models.claim import Claim
-from models.salesman import Salesman
 from crud.claim_crud import (
     submit_claim,
-    get_all_claims,
+    submit_claim_once,
     approve_claim_by_id,
     reject_claim_by_id,
     amend_and_approve_claim,
     get_claim_by_id,
-    
+    bulk_approve_claims,
+    bulk_reject_claims,
+    claims_query,
 )
+from utils.pagination import encode_cursor
 from utils.security import get_current_user_role
 
 router = APIRouter()
@@ -22,58 +29,132 @@ router = APIRouter()
 @router.post("/claim", response_model=ClaimOut)
 def request_withdrawal(
     payload: ClaimRequest,
+    response: Response,
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key", max_length=255),
     db: Session = Depends(get_db),
     salesman=Depends(get_current_user_role("salesman"))
 ):
-    claim = submit_claim(db, salesman.id, amount=payload.amount, remarks=payload.remarks)
+    """
+    Send an Idempotency-Key header to make retries safe: repeating the
+    request with the same key returns the original claim.
+    """
+    if idempotency_key:
+        claim, replayed = submit_claim_once(db, salesman.id, payload.amount, payload.remarks, idempotency_key)
+        if replayed:
+            response.headers["Idempotent-Replayed"] = "true"
+    else:
+        claim = submit_claim(db, salesman.id, amount=payload.amount, remarks=payload.remarks)
     if not claim:
         raise HTTPException(status_code=400, detail="Insufficient wallet balance or invalid claim.")
     return claim
 
+# Page size for /claims when no date range is given
+DEFAULT_CLAIMS_LIMIT = 4000
+
+
+def _claims_page(response: Response, query, limit: Optional[int]):
+    """
+    Apply `limit`; when the page is full, X-Next-Cursor holds the cursor
+    for the next one.
+    """
+    if limit:
+        query = query.limit(limit)
+    rows = query.all()
+    if limit and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].timestamp, rows[-1].id)
+    return rows
+
+
 @router.get("/my-claims", response_model=list[ClaimOut])
 def view_my_claims(
+    response: Response,
+    status: str = Query(None),
+    limit: int = Query(None, ge=1),
+    cursor: str = Query(None),
     db: Session = Depends(get_db),
     salesman=Depends(get_current_user_role("salesman"))
 ):
-    all_claims = get_all_claims(db)
-    return [c for c in all_claims if c.salesman_id == salesman.id]
+    """
+    Salesman: my claims, newest first (an index range scan on salesman_id).
+    """
+    query = claims_query(db, status=status, salesman_id=salesman.id, cursor=cursor)
+    return _claims_page(response, query, limit)
 
 
 # ------------------ ADMIN ROUTES ------------------ #
 
 @router.get("/claims", response_model=list[ClaimOut])
 def view_all_claims(
+    response: Response,
+    status: str = Query(None),
+    from_date: str = Query(None),
+    to_date: str = Query(None),
+    salesman_id: int = Query(None),
+    outlet: str = Query(None),
+    limit: int = Query(None, ge=1),
+    cursor: str = Query(None),
     db: Session = Depends(get_db),
     admin=Depends(get_current_user_role("admin"))
 ):
-    claims = db.query(Claim).all()
-    salesman_map = {
-        s.id: s.name for s in db.query(Salesman.id, Salesman.name).all()
-    }
-    return [
-        {
-            **claim.__dict__,
-            "salesman_name": salesman_map.get(claim.salesman_id, f"#ID {claim.salesman_id}")
-        }
-        for claim in claims
-    ]
+    """
+    Admin: claims with optional filters, newest first.
+    If no date range is given, limit to latest 4000 records.
+    When a page is full, X-Next-Cursor holds the cursor for the next page.
+    """
+    if limit is None and not (from_date and to_date):
+        limit = DEFAULT_CLAIMS_LIMIT
+
+    query = claims_query(db, status, from_date, to_date, salesman_id, outlet, cursor)
+    return _claims_page(response, query, limit)
 
 @router.get("/claims/pending", response_model=list[ClaimOut])
 def view_pending_claims(
+    response: Response,
+    outlet: str = Query(None),
+    limit: int = Query(None, ge=1),
+    cursor: str = Query(None),
     db: Session = Depends(get_db),
     admin=Depends(get_current_user_role("admin"))
 ):
-    pending_claims = db.query(Claim).filter_by(status="pending").order_by(Claim.timestamp.desc()).all()
-    salesman_map = {
-        s.id: s.name for s in db.query(Salesman.id, Salesman.name).all()
-    }
-    return [
-        {
-            **claim.__dict__,
-            "salesman_name": salesman_map.get(claim.salesman_id, f"#ID {claim.salesman_id}")
-        }
-        for claim in pending_claims
-    ]
+    """
+    Admin: every pending claim unless `limit` is given, newest first.
+    """
+    query = claims_query(db, status="pending", outlet=outlet, cursor=cursor)
+    return _claims_page(response, query, limit)
+
+def _bulk_response(results: list[dict]) -> dict:
+    failed = sum(r["status"] == "failed" for r in results)
+    return {"succeeded": len(results) - failed, "failed": failed, "results": results}
+
+
+# Declared before /claims/{claim_id}/... so "bulk" isn't taken for a claim id
+@router.post("/claims/bulk/approve", response_model=BulkClaimResponse)
+def bulk_approve(
+    payload: BulkApproveRequest,
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user_role("admin"))
+):
+    """
+    Approve a payout run in one transaction. Claims that can't be approved
+    are reported per id (repeated ids count once, the last tx_hash wins).
+    """
+    tx_hashes = {item.id: item.tx_hash for item in payload.claims}
+    return _bulk_response(bulk_approve_claims(db, tx_hashes))
+
+
+@router.post("/claims/bulk/reject", response_model=BulkClaimResponse)
+def bulk_reject(
+    payload: BulkRejectRequest,
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user_role("admin"))
+):
+    """
+    Reject claims in one transaction and refund them to the wallets.
+    """
+    ids = list(dict.fromkeys(payload.ids))
+    return _bulk_response(bulk_reject_claims(db, ids, reason=payload.reason))
+
+
 @router.post("/claims/{claim_id}/approve", response_model=ClaimOut)
 def approve_claim(
     claim_id: int,
@@ -116,12 +197,18 @@ def get_claim_summary(
     from models.claim import Claim
 
     # Total incentive earned
-    total_incentive = db.query(Incentive).filter_by(salesman_id=salesman.id).with_entities(Incentive.amount).all()
-    total_incentive_sum = sum([i.amount for i in total_incentive])
+    total_incentive_sum = (
+        db.query(func.coalesce(func.sum(Incentive.amount), 0.0))
+        .filter(Incentive.salesman_id == salesman.id)
+        .scalar()
+    )
 
     # Total withdrawn (approved claims)
-    total_withdrawn = db.query(Claim).filter_by(salesman_id=salesman.id, status="approved").with_entities(Claim.amount).all()
-    total_withdrawn_sum = sum([c.amount for c in total_withdrawn])
+    total_withdrawn_sum = (
+        db.query(func.coalesce(func.sum(Claim.amount), 0.0))
+        .filter(Claim.salesman_id == salesman.id, Claim.status == "approved")
+        .scalar()
+    )
 
     # Wallet balance
     wallet_balance = salesman.wallet_balance or 0.0
@@ -1,16 +1,20 @@
 # incentive-app/backend/api/incentive_router.py
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
+from db.database import get_db
 from datetime import date
 from sqlalchemy import func
 from models.incentive import Incentive
 from models.leaderboardincentive import LeaderboardIncentive
+from models.salesman import Salesman
 from schemas.incentive_schema import IncentiveOut, IncentiveSchema
 from schemas.claim_schema import ClaimRequest, ClaimOut
 from schemas.incentive_schema import IncentiveSchema
 from services.reward_distributor import reward_top_salesman
+from services.job_queue import submit_job
+from services.rank_index import rank_index
+from utils.date_range import day_bounds
 from crud.incentive_crud import (
     toggle_incentive_visibility,
     get_incentives_for_salesman,
@@ -26,15 +30,6 @@ from utils.security import get_current_user_role
 
 router = APIRouter()
 
-# DB Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ✅ Salesman: View visible incentives
 @router.get("/my-incentives", response_model=list[IncentiveOut])
 def get_my_incentives(
@@ -82,10 +77,23 @@ def approve_claim(
 # ✅ Admin: Trigger generation of incentives
 @router.post("/generate")
 def generate(
+    full: bool = Query(False),
+    background: bool = Query(False),
     db: Session = Depends(get_db),
     admin=Depends(get_current_user_role("admin"))
 ):
-    return generate_incentives(db)
+    """
+    Admin: Match new sales since the last run; ?full=true rescans all sales.
+    ?background=true queues the run and returns a job id to poll.
+    """
+    if background:
+        job = submit_job(
+            db, "generate_incentives",
+            lambda job_db, progress: generate_incentives(job_db, full_rescan=full),
+            created_by=admin.mobile
+        )
+        return {"job_id": job.id, "status": job.status}
+    return generate_incentives(db, full_rescan=full)
 
 
 # ✅ Admin: View all incentives
@@ -126,10 +134,12 @@ def incentive_summary(
         Incentive.is_visible == True
     ).scalar() or 0
 
+    day_start, day_end = day_bounds(today)
     today_total = db.query(func.sum(Incentive.amount)).filter(
         Incentive.salesman_id == salesman.id,
         Incentive.is_visible == True,
-        func.date(Incentive.timestamp) == today
+        Incentive.timestamp >= day_start,
+        Incentive.timestamp < day_end
     ).scalar() or 0
 
     return {"total": total, "today": today_total}
@@ -139,25 +149,33 @@ def get_rank(
     db: Session = Depends(get_db),
     salesman=Depends(get_current_user_role("salesman"))
 ):
-    # Subquery: total incentive per salesman
-    subq = (
-        db.query(
-            Incentive.salesman_id,
-            func.sum(Incentive.amount).label("total_incentive")
-        )
-        .filter(Incentive.is_visible == True)
-        .group_by(Incentive.salesman_id)
-        .subquery()
-    )
+    """
+    Salesman: my position by total visible incentive (ties share a rank).
+    """
+    rank_index.ensure_fresh(db)
+    return {"rank": rank_index.rank(salesman.id)}
 
-    # Fetch ranked list
-    ranked = db.query(subq).order_by(subq.c.total_incentive.desc()).all()
 
-    for i, row in enumerate(ranked):
-        if row.salesman_id == salesman.id:
-            return {"rank": i + 1}
-
-    return {"rank": None}
+@router.get("/rank/neighbors")
+def get_rank_neighbors(
+    radius: int = Query(2, ge=1, le=20),
+    db: Session = Depends(get_db),
+    salesman=Depends(get_current_user_role("salesman"))
+):
+    """
+    Salesman: the salesmen ranked just above and below me.
+    """
+    rank_index.ensure_fresh(db)
+    window = rank_index.neighbors(salesman.id, radius)
+    names = dict(
+        db.query(Salesman.id, Salesman.name)
+        .filter(Salesman.id.in_([row["salesman_id"] for row in window]))
+        .all()
+    ) if window else {}
+    return [
+        {**row, "name": names.get(row["salesman_id"]), "is_me": row["salesman_id"] == salesman.id}
+        for row in window
+    ]
 
 @router.post("/admin/set-leaderboard-incentives")
 def set_incentives(payload: IncentiveSchema, db: Session = Depends(get_db)):
@@ -181,14 +199,20 @@ def get_incentives(db: Session = Depends(get_db)):
         "month": data.month_amount if data else 0
     }
 
+def _reward(db: Session, period: str, background: bool):
+    if background:
+        job = submit_job(db, f"reward_{period}", lambda job_db, progress: reward_top_salesman(job_db, period))
+        return {"job_id": job.id, "status": job.status}
+    return {"message": reward_top_salesman(db, period)}
+
 @router.post("/admin/reward/daily")
-def reward_day(db: Session = Depends(get_db)):
-    return {"message": reward_top_salesman(db, "day")}
+def reward_day(background: bool = Query(False), db: Session = Depends(get_db)):
+    return _reward(db, "day", background)
 
 @router.post("/admin/reward/weekly")
-def reward_week(db: Session = Depends(get_db)):
-    return {"message": reward_top_salesman(db, "week")}
+def reward_week(background: bool = Query(False), db: Session = Depends(get_db)):
+    return _reward(db, "week", background)
 
 @router.post("/admin/reward/monthly")
-def reward_month(db: Session = Depends(get_db)):
-    return {"message": reward_top_salesman(db, "month")}
\ No newline at end of file
+def reward_month(background: bool = Query(False), db: Session = Depends(get_db)):
+    return _reward(db, "month", background)
\ No newline at end of file
@@ -0,0 +1,81 @@
+# backend/api/job_router.py
+
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import FileResponse
+from starlette.background import BackgroundTask
+from sqlalchemy.orm import Session
+
+from db.database import get_db
+from schemas.job_schema import JobOut
+from services.job_queue import get_job, get_progress, list_jobs, remove_result_file
+from utils.security import get_current_user_role
+
+router = APIRouter()
+
+
+def _job_out(job) -> JobOut:
+    out = JobOut.model_validate(job)
+    live = get_progress(job.id)
+    if live and job.status == "running":
+        out.processed, out.total = live
+    return out
+
+
+@router.get("/", response_model=list[JobOut])
+def view_jobs(
+    limit: int = Query(50, le=500),
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user_role("admin"))
+):
+    """
+    Admin: Most recent background jobs, newest first.
+    """
+    return [_job_out(j) for j in list_jobs(db, limit)]
+
+
+@router.get("/{job_id}", response_model=JobOut)
+def view_job(
+    job_id: str,
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user_role("admin"))
+):
+    """
+    Admin: Poll status and progress of a background job.
+    """
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return _job_out(job)
+
+
+@router.get("/{job_id}/result")
+def view_job_result(
+    job_id: str,
+    db: Session = Depends(get_db),
+    admin=Depends(get_current_user_role("admin"))
+):
+    """
+    Admin: Result of a finished job. Export jobs return the generated file,
+    which is deleted once downloaded (later requests get 410).
+    """
+    job = get_job(db, job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    if job.status == "failed":
+        raise HTTPException(status_code=409, detail=f"Job failed: {job.error}")
+    if job.status != "succeeded":
+        raise HTTPException(status_code=409, detail=f"Job is {job.status}")
+
+    result = job.result or {}
+    if "file_path" in result:
+        if not os.path.exists(result["file_path"]):
+            raise HTTPException(status_code=410, detail="Job result file is no longer available")
+        return FileResponse(
+            result["file_path"],
+            media_type=result.get("media_type"),
+            filename=result.get("filename"),
+            background=BackgroundTask(remove_result_file, result["file_path"])
+        )
+    return result
@@ -1,19 +1,23 @@
 # backend/api/leaderboard_router.py
 
-from fastapi import APIRouter, Depends, Query
+import asyncio
+import json
+
+from fastapi import APIRouter, Depends, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func
-from db.database import get_db, SessionLocal
-from models.sale import Sale  # ✅ Add this import
-from models.salesman import Salesman
-from datetime import date
-from utils.date_range import get_week_range_and_label, get_month_range
+from db.database import get_db
 from pydantic import BaseModel
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.async_database import get_async_db
+from services.leaderboard_cache import get_snapshot_async, snapshot_response
+from services.leaderboard_events import broadcaster, PUSH_BOARDS
 
 
 from crud.leaderboard_crud import (
     get_leaderboard,
     calculate_leaderboard,
+    leaderboard_payload,
     get_streak_leaderboard,
     update_user_streak,
 )
@@ -21,15 +25,6 @@ from crud.leaderboard_crud import (
 router = APIRouter()
 
 
-# Dependency to get DB session
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 # ---------------- Leaderboard Endpoints ---------------- #
 
 @router.get("/")
@@ -43,53 +38,72 @@ def leaderboard_view(
     return get_leaderboard(db, scope)
 
 
+# Served from cached snapshots (see services/leaderboard_cache.py);
+# clients can revalidate with If-None-Match. These run on the async
+# session, so a cache miss doesn't tie up a threadpool worker.
+
+async def _board(request: Request, db: AsyncSession, board: str):
+    snapshot = await get_snapshot_async(board, lambda: db.run_sync(leaderboard_payload, board))
+    return snapshot_response(request, snapshot)
+
 @router.get("/day")
-def leaderboard_day(db: Session = Depends(get_db)):
-    return calculate_leaderboard(db, period="day")
+async def leaderboard_day(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _board(request, db, "day")
 
 @router.get("/week")
-def get_week_leaderboard(db: Session = Depends(get_db)):
-    today = date.today()
-    start, end, label = get_week_range_and_label(today)
-
-    results = (
-        db.query(Salesman.name, func.sum(Sale.amount).label("sales"))
-        .join(Salesman, Salesman.id == Sale.salesman_id)
-        .filter(func.date(Sale.timestamp) >= start)
-        .filter(func.date(Sale.timestamp) <= end)
-        .group_by(Salesman.name)
-        .order_by(func.sum(Sale.amount).desc())
-        .all()
-    )
+async def get_week_leaderboard(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _board(request, db, "week")
 
-    return {"label": label, "data": [{"name": r.name, "sales": r.sales} for r in results]}
 
+@router.get("/month")
+async def get_month_leaderboard(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _board(request, db, "month")
 
 
+@router.get("/streak")
+async def leaderboard_streak(request: Request, db: AsyncSession = Depends(get_async_db)):
+    return await _board(request, db, "streak")
 
-@router.get("/month")
-def get_month_leaderboard(db: Session = Depends(get_db)):
-    today = date.today()
-    start, end, label = get_month_range(today)
-
-    results = (
-        db.query(Salesman.name, func.sum(Sale.amount).label("sales"))
-        .join(Salesman, Salesman.id == Sale.salesman_id)
-        .filter(func.date(Sale.timestamp) >= start)
-        .filter(func.date(Sale.timestamp) <= end)
-        .group_by(Salesman.name)
-        .order_by(func.sum(Sale.amount).desc())
-        .all()
-    )
 
-    return {"label": label, "data": [{"name": r.name, "sales": r.sales} for r in results]}
+# Seconds between keep-alive comments on an idle stream
+STREAM_HEARTBEAT = 15
 
 
+def _sse(event: str, data) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
 
 
-@router.get("/streak")
-def leaderboard_streak(db: Session = Depends(get_db)):
-    return get_streak_leaderboard(db)
+@router.get("/stream")
+async def leaderboard_stream(
+    request: Request,
+    board: str = Query("day", enum=list(PUSH_BOARDS))
+):
+    """
+    Server-Sent Events feed of a leaderboard.
+    Sends a `snapshot` event with the current standings, then an `update`
+    event (changed entries, removed names and the full standings) whenever
+    the standings move.
+    """
+    queue, payload = await broadcaster.subscribe(board)
+
+    async def events():
+        try:
+            yield _sse("snapshot", {"board": board, "standings": payload})
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(queue.get(), timeout=STREAM_HEARTBEAT)
+                except asyncio.TimeoutError:
+                    yield ": ping\n\n"
+                    continue
+                yield _sse("update", event)
+        finally:
+            broadcaster.unsubscribe(board, queue)
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 
 # ---------------- Streak Update Endpoint ---------------- #
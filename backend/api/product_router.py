@@ -1,26 +1,18 @@
 # incentive-app/backend/api/product_router.py
 
-from fastapi import APIRouter, Depends, UploadFile, File, HTTPException
+from fastapi import APIRouter, Depends, UploadFile, File, HTTPException, Query
 from sqlalchemy.orm import Session
 from tempfile import NamedTemporaryFile
 import shutil
 
-from db.database import SessionLocal
+from db.database import get_db
 from schemas.product_schema import ProductSubmit
 from crud.product_crud import upsert_product, upsert_products_from_file
 from utils.security import get_current_user_role
-from models.product import Product
-from models.trait_config import TraitConfig
+from services.catalog_cache import resolve_barcode, get_trait, get_products, get_trait_map
+from services.barcode_index import search_barcodes
 router = APIRouter(prefix="/api/products", tags=["Products"])
 
-# 🔌 DB Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # 📦 Bulk Product Upload
 @router.post("/upload-file")
 def upload_product_file(
@@ -60,23 +52,50 @@ def add_product(
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to save product: {str(e)}")
 
+@router.get("/search")
+def search_products(
+    q: str = Query(..., min_length=1),
+    limit: int = Query(10, ge=1, le=50),
+    db: Session = Depends(get_db)
+):
+    """
+    Ranked partial-barcode search for damaged labels: exact, prefix, suffix,
+    then other substring matches.
+    """
+    matches = search_barcodes(db, q, limit)
+    products = get_products(db, [barcode for barcode, _ in matches])
+    traits = get_trait_map(db)
+
+    results = []
+    for barcode, match in matches:
+        product = products.get(barcode)
+        if not product:
+            continue
+        trait_config = traits.get(product["trait"])
+        results.append({
+            "barcode": barcode,
+            "price": product["rsp"],
+            "traitPercentage": trait_config["percentage"] if trait_config else None,
+            "match": match
+        })
+    return results
+
 @router.get("/{barcode}")
 def get_product(barcode: str, db: Session = Depends(get_db)):
     barcode = barcode.strip()
 
-    product = db.query(Product).filter(Product.barcode == barcode).first()
-    if not product:
-        product = db.query(Product).filter(Product.barcode.like(f"%{barcode}%")).first()
+    # Served from the catalog cache; the DB is only hit on a miss
+    product = resolve_barcode(db, barcode)
     if not product:
         raise HTTPException(status_code=404, detail="Product not found")
 
     # Get the trait config percentage
-    trait_config = db.query(TraitConfig).filter(TraitConfig.trait == product.trait).first()
+    trait_config = get_trait(db, product["trait"])
     if not trait_config:
         raise HTTPException(status_code=404, detail="Trait percentage not found")
 
     return {
-        "barcode": product.barcode,
-        "price": product.rsp,
-        "traitPercentage": trait_config.percentage
+        "barcode": product["barcode"],
+        "price": product["rsp"],
+        "traitPercentage": trait_config["percentage"]
     }
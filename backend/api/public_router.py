@@ -1,19 +1,11 @@
 from fastapi import APIRouter, Depends
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
+from db.database import get_db
 from models.outlet import Outlet
 from models.verticle import Verticle
 
 router = APIRouter(prefix="/public", tags=["Public"])
 
-# --- DB Dependency ---
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 # --- Public: List outlets for signup ---
 @router.get("/outlets", response_model=list[dict])
 def list_public_outlets(db: Session = Depends(get_db)):
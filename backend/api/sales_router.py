@@ -1,28 +1,18 @@
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, Query, Response
 from sqlalchemy.orm import Session
 from schemas.sale_schema import SaleSubmit, SaleOut
-from crud.sale_crud import submit_sale, get_sales_by_salesman
-from db.database import SessionLocal
+from crud.sale_crud import submit_sale, get_sales_by_salesman, admin_sales_query
+from db.database import get_db
 from utils.security import get_current_user_role
-from models.sale import Sale
-from models.salesman import Salesman
+from services.job_queue import submit_job
+from utils.export import EXPORT_FORMATS, FETCH_SIZE, export_job, export_response
+from utils.pagination import encode_cursor
 from schemas.salesman_schema import AdminSaleOut
-from fastapi.responses import StreamingResponse
 from typing import List
-import pandas as pd
-import io
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
-
 @router.post("/submit", response_model=list[SaleOut])
 def create_sale(
     sale: SaleSubmit,
@@ -43,52 +33,67 @@ def my_sales(
     return get_sales_by_salesman(db, salesman.id)
 
 
+# Page size when no date range is given
+DEFAULT_SALES_LIMIT = 4000
+
+
 @router.get("/admin/sales", response_model=List[AdminSaleOut])
 def get_admin_sales(
+    response: Response,
     db: Session = Depends(get_db),
     from_date: str = Query(None),
     to_date: str = Query(None),
     outlet: str = Query(None),
-    search: str = Query(None)
+    search: str = Query(None),
+    limit: int = Query(None, ge=1),
+    cursor: str = Query(None)
 ):
     """
-    Admin: View all sales with optional filters.
+    Admin: View all sales with optional filters, newest first.
     If no date range is given, limit to latest 4000 records.
+    When a page is full, X-Next-Cursor holds the cursor for the next page.
     """
-    query = db.query(Sale)
-
-    if from_date and to_date:
-        query = query.filter(Sale.timestamp.between(from_date, to_date))
-    else:
-        query = query.order_by(Sale.timestamp.desc()).limit(4000)
-
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Sale.customer_name.ilike(search_term)) |
-            (Sale.customer_number.ilike(search_term)) |
-            (Sale.barcode.ilike(search_term))
-        )
-
-    sales = query.all()
-    result = []
-
-    for s in sales:
-        salesman = db.query(Salesman).filter_by(id=s.salesman_id).first()
-        if outlet and (not salesman or salesman.outlet != outlet):
-            continue
-        result.append({
-            "timestamp": s.timestamp,
-            "customer_name": s.customer_name,
-            "customer_number": s.customer_number,
-            "barcode": s.barcode,
-            "qty": s.qty,
-            "amount": s.amount,
-            "salesman_name": salesman.name if salesman else "Unknown",
-            "outlet": salesman.outlet if salesman else "Unknown"
-        })
-
-    return result
+    if limit is None and not (from_date and to_date):
+        limit = DEFAULT_SALES_LIMIT
+
+    query = admin_sales_query(db, from_date, to_date, outlet, search, cursor)
+    if limit:
+        query = query.limit(limit)
+    rows = query.all()
+
+    if limit and len(rows) == limit:
+        response.headers["X-Next-Cursor"] = encode_cursor(rows[-1].timestamp, rows[-1].id)
+
+    return rows
+
+
+SALES_EXPORT_COLUMNS = [
+    ("Date", str), ("Customer", str), ("Phone", str), ("Barcode", str),
+    ("Qty", int), ("Amount", float), ("Salesman", str), ("Outlet", str)
+]
+
+
+def _sales_export_source(from_date: str, to_date: str, outlet: str, search: str):
+    """
+    Row source for the sales export, read through a server-side cursor.
+    """
+    def rows(db: Session):
+        query = admin_sales_query(db, from_date, to_date, outlet, search)
+        if not (from_date and to_date):
+            query = query.limit(DEFAULT_SALES_LIMIT)
+        for s in query.yield_per(FETCH_SIZE):
+            yield (
+                s.timestamp.strftime("%Y-%m-%d"),
+                s.customer_name,
+                s.customer_number,
+                s.barcode,
+                s.qty,
+                s.amount,
+                s.salesman_name,
+                s.outlet
+            )
+
+    return rows
 
 
 @router.get("/admin/sales/xlsx")
@@ -97,59 +102,19 @@ def export_admin_sales_xlsx(
     from_date: str = Query(None),
     to_date: str = Query(None),
     outlet: str = Query(None),
-    search: str = Query(None)
+    search: str = Query(None),
+    fmt: str = Query("xlsx", alias="format", enum=list(EXPORT_FORMATS)),
+    background: bool = Query(False)
 ):
     """
-    Admin: Export filtered sales to Excel (.xlsx)
+    Admin: Export filtered sales to Excel (.xlsx), or CSV / Parquet via ?format=
     If no date range is provided, limit to latest 4000.
+    ?background=true returns a job id; fetch the file from /api/jobs/{id}/result.
     """
-    query = db.query(Sale)
-
-    if from_date and to_date:
-        query = query.filter(Sale.timestamp.between(from_date, to_date))
-    else:
-        query = query.order_by(Sale.timestamp.desc()).limit(4000)
-
-    if search:
-        search_term = f"%{search}%"
-        query = query.filter(
-            (Sale.customer_name.ilike(search_term)) |
-            (Sale.customer_number.ilike(search_term)) |
-            (Sale.barcode.ilike(search_term))
-        )
-
-    sales = query.all()
-    rows = []
-
-    for s in sales:
-        salesman = db.query(Salesman).filter_by(id=s.salesman_id).first()
-        if outlet and (not salesman or salesman.outlet != outlet):
-            continue
-        rows.append({
-            "Date": s.timestamp.strftime("%Y-%m-%d"),
-            "Customer": s.customer_name,
-            "Phone": s.customer_number,
-            "Barcode": s.barcode,
-            "Qty": s.qty,
-            "Amount": s.amount,
-            "Salesman": salesman.name if salesman else "Unknown",
-            "Outlet": salesman.outlet if salesman else "Unknown"
-        })
-
-    if not rows:
-        rows.append({
-            "Date": "", "Customer": "", "Phone": "", "Barcode": "",
-            "Qty": "", "Amount": "", "Salesman": "", "Outlet": ""
-        })
-
-    df = pd.DataFrame(rows)
-    output = io.BytesIO()
-    with pd.ExcelWriter(output, engine='xlsxwriter') as writer:
-        df.to_excel(writer, index=False, sheet_name='Sales')
-    output.seek(0)
-
-    return StreamingResponse(
-        output,
-        media_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
-        headers={"Content-Disposition": "attachment; filename=sales_report.xlsx"}
-    )
+    source = _sales_export_source(from_date, to_date, outlet, search)
+
+    if background:
+        job = submit_job(db, "sales_export", export_job(source, SALES_EXPORT_COLUMNS, fmt, "sales_report", "Sales"))
+        return {"job_id": job.id, "status": job.status}
+
+    return export_response(db, source, SALES_EXPORT_COLUMNS, fmt, "sales_report", "Sales")
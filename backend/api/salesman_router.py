@@ -2,19 +2,20 @@ from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 from datetime import datetime, date, timedelta
 from db.database import get_db
-from crud.salesman_crud import get_all_approved_salesmen, delete_salesman
+from crud.salesman_crud import get_all_approved_salesmen, delete_salesman, summarize_salesmen, salesman_summary_query
 from schemas.salesman_schema import SalesmanOut, SalesmanSummaryOut
 from utils.security import get_current_user_role
-from models.sale import Sale
-from models.incentive import Incentive
-from utils.security import get_current_salesman
+from models.daily_sales_rollup import DailySalesRollup
+from crud.rollup_crud import utc_today
+from utils.security import get_current_salesman_async
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.async_database import get_async_db
+from services.job_queue import submit_job
+from utils.export import EXPORT_FORMATS, FETCH_SIZE, export_job, export_response
 from models.claim import Claim
 from models.salesman import Salesman
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, select
 from typing import Optional, List
-import io
-from openpyxl import Workbook
-from fastapi.responses import StreamingResponse
 router = APIRouter()
 
 @router.get("/salesmen", response_model=list[SalesmanOut])
@@ -46,32 +47,28 @@ def get_me(
     return salesman
 
 @router.get("/stats")
-def get_salesman_stats(db: Session = Depends(get_db), current_user=Depends(get_current_salesman)):
-    today = date.today()
+async def get_salesman_stats(
+    db: AsyncSession = Depends(get_async_db),
+    current_user=Depends(get_current_salesman_async)
+):
+    today = utc_today()
     month_start = today.replace(day=1)
 
-    # Monthly sales
-    month_sales = db.query(Sale).filter(
-        Sale.salesman_id == current_user.id,
-        Sale.timestamp >= month_start
-    ).all()
-    month_sales_count = len(month_sales)
-    month_sales_amount = sum(s.amount for s in month_sales)
-
-    # Today's sales
-    today_sales = db.query(Sale).filter(
-        Sale.salesman_id == current_user.id,
-        Sale.timestamp >= today
-    ).all()
-    today_sales_count = len(today_sales)
-    today_sales_amount = sum(s.amount for s in today_sales)
-
-    # Today's incentive
-    today_incentives = db.query(Incentive).filter(
-        Incentive.salesman_id == current_user.id,
-        Incentive.timestamp >= today
-    ).all()
-    today_incentive_sum = sum(i.amount for i in today_incentives)
+    # Month and today totals from the daily rollup
+    month = (await db.execute(
+        select(
+            func.coalesce(func.sum(DailySalesRollup.count), 0).label("count"),
+            func.coalesce(func.sum(DailySalesRollup.amount), 0.0).label("amount")
+        )
+        .where(DailySalesRollup.salesman_id == current_user.id, DailySalesRollup.day >= month_start)
+    )).one()
+    month_sales_count = month.count
+    month_sales_amount = month.amount
+
+    today_row = await db.get(DailySalesRollup, (current_user.id, today))
+    today_sales_count = today_row.count if today_row else 0
+    today_sales_amount = today_row.amount if today_row else 0.0
+    today_incentive_sum = today_row.incentive if today_row else 0.0
 
     # Wallet balance
     wallet_balance = current_user.wallet_balance or 0.0
@@ -86,103 +83,92 @@ def get_salesman_stats(db: Session = Depends(get_db), current_user=Depends(get_c
     }
 
 
-@router.get("/summary", response_model=List[SalesmanSummaryOut])
-def get_salesman_summaries(
-    period: str = Query("total", enum=["today", "month", "total"]),
-    from_date: Optional[date] = Query(None, alias="from"),
-    to_date: Optional[date] = Query(None, alias="to"),
-    db: Session = Depends(get_db)
-):
-    salesmen = db.query(Salesman).filter(Salesman.is_approved == True).all()
-    summaries = []
-
-    now = datetime.now()
+def _summary_range(period: str, from_date: Optional[date], to_date: Optional[date]):
+    """
+    (start, end) datetimes for a summary period; explicit from/to wins.
+    "today" and "month" follow the UTC calendar, as rollup days do.
+    """
+    today = utc_today()
 
-    # Calculate start_date and end_date
     start_date, end_date = None, None
     if from_date and to_date:
         start_date = datetime.combine(from_date, datetime.min.time())
         end_date = datetime.combine(to_date, datetime.max.time())
     elif period == "today":
-        start_date = now.replace(hour=0, minute=0, second=0, microsecond=0)
-        end_date = now
+        start_date = datetime.combine(today, datetime.min.time())
+        end_date = datetime.combine(today, datetime.max.time())
     elif period == "month":
-        start_date = now.replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+        start_date = datetime.combine(today.replace(day=1), datetime.min.time())
         next_month = start_date.replace(day=28) + timedelta(days=4)
         end_date = next_month.replace(day=1) - timedelta(seconds=1)
+    return start_date, end_date
+
+
+@router.get("/summary", response_model=List[SalesmanSummaryOut])
+def get_salesman_summaries(
+    period: str = Query("total", enum=["today", "month", "total"]),
+    from_date: Optional[date] = Query(None, alias="from"),
+    to_date: Optional[date] = Query(None, alias="to"),
+    outlet: Optional[str] = Query(None),
+    verticle: Optional[str] = Query(None),
+    limit: Optional[int] = Query(None, ge=1),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    start_date, end_date = _summary_range(period, from_date, to_date)
+    return summarize_salesmen(
+        db, start_date, end_date,
+        outlet=outlet, verticle=verticle, limit=limit, offset=offset
+    )
+
+SUMMARY_EXPORT_COLUMNS = [
+    ("ID", int), ("Name", str), ("Mobile", str), ("Outlet", str),
+    ("Total Sales", float), ("Incentive", float), ("Claimed", float), ("Wallet", float)
+]
+
+
+def _summary_export_source(start_date, end_date, outlet: Optional[str], verticle: Optional[str]):
+    """
+    Row source for the salesman summary export, read through a server-side cursor.
+    """
+    def rows(db: Session):
+        query = salesman_summary_query(db, start_date, end_date, outlet, verticle)
+        for s in query.yield_per(FETCH_SIZE):
+            yield (
+                s.id,
+                s.name,
+                s.mobile,
+                s.outlet or "",
+                round(s.total_sales or 0.0, 2),
+                round(s.total_incentive or 0.0, 2),
+                round(s.total_claimed or 0.0, 2),
+                round(s.wallet_balance or 0.0, 2)
+            )
+
+    return rows
 
-    for s in salesmen:
-        # Sales total
-        sale_query = db.query(func.sum(Sale.amount)).filter(Sale.salesman_id == s.id)
-        if start_date:
-            sale_query = sale_query.filter(Sale.timestamp >= start_date)
-        if end_date:
-            sale_query = sale_query.filter(Sale.timestamp <= end_date)
-        total_sales = sale_query.scalar() or 0
-
-        # Incentives total
-        incentive_query = db.query(func.sum(Incentive.amount)).filter(Incentive.salesman_id == s.id)
-        if start_date:
-            incentive_query = incentive_query.filter(Incentive.timestamp >= start_date)
-        if end_date:
-            incentive_query = incentive_query.filter(Incentive.timestamp <= end_date)
-        total_incentive = incentive_query.scalar() or 0.0
-
-        # Claimed is all-time
-        total_claimed = db.query(func.sum(Claim.amount)).filter(
-            Claim.salesman_id == s.id,
-            Claim.status.in_(["approved", "paid"])
-        ).scalar() or 0.0
-
-        summaries.append(SalesmanSummaryOut(
-            id=s.id,
-            name=s.name,
-            mobile=s.mobile,
-            outlet=s.outlet,
-            total_sales=total_sales,
-            total_incentive=total_incentive,
-            total_claimed=total_claimed,
-            wallet_balance=s.wallet_balance or 0.0
-        ))
-
-    return summaries
 
 @router.get("/summary/xlsx")
 def export_salesman_summary_xlsx(
     period: str = Query("total", enum=["today", "month", "total"]),
     from_date: Optional[date] = Query(None, alias="from"),
     to_date: Optional[date] = Query(None, alias="to"),
+    outlet: Optional[str] = Query(None),
+    verticle: Optional[str] = Query(None),
+    fmt: str = Query("xlsx", alias="format", enum=list(EXPORT_FORMATS)),
+    background: bool = Query(False),
     db: Session = Depends(get_db)
 ):
-    data = get_salesman_summaries(period=period, from_date=from_date, to_date=to_date, db=db)
-
-    wb = Workbook()
-    ws = wb.active
-    ws.title = "Salesman Summary"
-
-    # Header
-    ws.append(["ID", "Name", "Mobile", "Outlet", "Total Sales", "Incentive", "Claimed", "Wallet"])
-
-    # Data rows
-    for s in data:
-        ws.append([
-            s.id,
-            s.name,
-            s.mobile,
-            s.outlet or "",
-            round(s.total_sales or 0.0, 2),
-            round(s.total_incentive or 0.0, 2),
-            round(s.total_claimed or 0.0, 2),
-            round(s.wallet_balance or 0.0, 2)
-        ])
-
-    stream = io.BytesIO()
-    wb.save(stream)
-    stream.seek(0)
-
-    filename = "salesman_summary.xlsx"
-    return StreamingResponse(
-        stream,
-        media_type="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        headers={"Content-Disposition": f"attachment; filename={filename}"}
-    )
\ No newline at end of file
+    """
+    ?format=csv|parquet switches the file type (default xlsx).
+    ?background=true returns a job id; fetch the file from /api/jobs/{id}/result.
+    """
+    start_date, end_date = _summary_range(period, from_date, to_date)
+    source = _summary_export_source(start_date, end_date, outlet, verticle)
+
+    if background:
+        run = export_job(source, SUMMARY_EXPORT_COLUMNS, fmt, "salesman_summary", "Salesman Summary")
+        job = submit_job(db, "salesman_summary_export", run)
+        return {"job_id": job.id, "status": job.status}
+
+    return export_response(db, source, SUMMARY_EXPORT_COLUMNS, fmt, "salesman_summary", "Salesman Summary")
@@ -1,8 +1,10 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
 from sqlalchemy.orm import Session
 from db.database import get_db
 from schemas.streak_schema import StreakOut
 from crud.streak_crud import get_streaks_for_salesman
+from crud.leaderboard_crud import leaderboard_payload
+from services.leaderboard_cache import cached_leaderboard
 from utils.security import get_current_user_role
 
 router = APIRouter(tags=["Streak"])
@@ -17,8 +19,8 @@ def view_streaks(salesman_id: int, db: Session = Depends(get_db), admin=Depends(
         raise HTTPException(status_code=404, detail="No streak data found")
     return streaks
 @router.get("/day")
-def leaderboard_day(db: Session = Depends(get_db)):
+def leaderboard_day(request: Request, db: Session = Depends(get_db)):
     """
     Public: Star of the Day leaderboard
     """
-    return calculate_leaderboard(db, period="day")
\ No newline at end of file
+    return cached_leaderboard(request, "day", lambda: leaderboard_payload(db, "day"))
@@ -2,20 +2,12 @@
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
+from db.database import get_db
 from crud import trait_config_crud
 from utils.security import get_current_user_role
 from schemas.trait_schema import TraitConfig, TraitUpdate
 router = APIRouter()
 
-# DB Dependency
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
-
 @router.get("/traits", response_model=list[dict])
 def get_all_traits(
     db: Session = Depends(get_db),
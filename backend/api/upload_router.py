@@ -1,121 +1,66 @@
-from fastapi import APIRouter, UploadFile, File, Depends, HTTPException
+import os
+
+from fastapi import APIRouter, UploadFile, File, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from db.database import SessionLocal
+from db.database import get_db
 from utils.security import get_current_user_role
+from utils.spreadsheet import spool_upload
 
-import pandas as pd
-from io import BytesIO
-from models.actual_sale import ActualSale
-from models.product import Product
+from crud.actual_sale_crud import import_actual_sales_file
+from crud.product_crud import import_base_file
+from services.job_queue import submit_job
 
 router = APIRouter()
 
 
-def get_db():
-    db = SessionLocal()
+def _import_upload(db: Session, file: UploadFile, importer, kind: str, background: bool, admin):
+    """
+    Spool the upload to disk and run importer(db, path, progress) on it, either
+    inline or as a background job. The spooled file is removed afterwards.
+    """
+    path = spool_upload(file)
+
+    def run(job_db: Session, progress=None):
+        try:
+            return importer(job_db, path, progress)
+        finally:
+            os.remove(path)
+
+    if background:
+        job = submit_job(db, kind, run, created_by=admin.mobile)
+        return {"job_id": job.id, "status": job.status}
+
     try:
-        yield db
-    finally:
-        db.close()
+        return run(db)
+    except Exception as e:
+        raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
 
 
 @router.post("/sales-file")
-async def upload_sales_file(
+def upload_sales_file(
     file: UploadFile = File(...),
+    background: bool = Query(False),
     db: Session = Depends(get_db),
     admin=Depends(get_current_user_role("admin"))
 ):
     """
-    Admin-only: Upload Excel file with actual sales.
-    Skips exact duplicates. Returns summary.
+    Admin-only: Upload Excel/CSV file with actual sales.
+    Skips exact duplicates. Returns summary (or a job id with ?background=true).
     Required columns: date, customer, barcode, qty, net amount
     """
-    try:
-        contents = await file.read()
-        df = pd.read_excel(BytesIO(contents))
-
-        required_columns = {"date", "customer", "barcode", "qty", "net amount"}
-        if not required_columns.issubset(df.columns):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file format. Required columns: date, customer, barcode, qty, net amount"
-            )
-
-        inserted = 0
-        skipped = 0
-        skipped_dates = set()
-
-        for _, row in df.iterrows():
-            try:
-                sale_data = {
-                    "date": pd.to_datetime(row["date"]),
-                    "customer": str(row["customer"]),
-                    "barcode": str(row["barcode"]),
-                    "qty": int(row["qty"]),
-                    "net_amount": float(row["net amount"]),
-                }
-            except Exception as e:
-                skipped += 1
-                continue
-
-            exists = db.query(ActualSale).filter_by(**sale_data).first()
-            if exists:
-                skipped += 1
-                skipped_dates.add(sale_data["date"].strftime("%Y-%m-%d"))
-                continue
-
-            db.add(ActualSale(**sale_data))
-            inserted += 1
-
-        db.commit()
-
-        return {
-            "message": "Sales file processed.",
-            "inserted": inserted,
-            "skipped": skipped,
-            "skipped_dates": sorted(list(skipped_dates))
-        }
-
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
+    return _import_upload(db, file, import_actual_sales_file, "sales_file", background, admin)
 
 
 @router.post("/base-file")
-async def upload_base_file(
+def upload_base_file(
     file: UploadFile = File(...),
+    background: bool = Query(False),
     db: Session = Depends(get_db),
     admin=Depends(get_current_user_role("admin"))
 ):
     """
-    Admin-only: Upload Excel file with base product info.
+    Admin-only: Upload Excel/CSV file with base product info.
     Upserts product based on barcode.
     Required columns: barcode, verticle, trait, rsp
     """
-    try:
-        contents = await file.read()
-        df = pd.read_excel(BytesIO(contents))
-
-        required_columns = {"barcode", "verticle", "trait", "rsp"}
-        if not required_columns.issubset(df.columns):
-            raise HTTPException(
-                status_code=400,
-                detail="Invalid file format. Required columns: barcode, verticle, trait, rsp"
-            )
-
-        for _, row in df.iterrows():
-            try:
-                product = Product(
-                    barcode=str(row["barcode"]),
-                    verticle=str(row["verticle"]),
-                    trait=str(row["trait"]),
-                    rsp=float(row["rsp"]),
-                )
-                db.merge(product)  # upsert
-            except Exception:
-                continue
-
-        db.commit()
-        return {"message": "Base file uploaded and stored successfully."}
-
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Upload failed: {str(e)}")
+    return _import_upload(db, file, import_base_file, "base_file", background, admin)
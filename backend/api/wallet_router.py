@@ -1,26 +1,42 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from db.database import get_db
-from utils.security import get_current_user_role
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from db.async_database import get_async_db
+from utils.security import get_current_user_role_async
 from models.incentive import Incentive
 from schemas.incentive_schema import IncentiveOut
+from schemas.wallet_schema import WalletEntryOut
+from crud.wallet_crud import get_ledger
 
 router = APIRouter()
 
 
 
 @router.get("/wallet")
-def get_wallet_balance(
-    db: Session = Depends(get_db),
-    salesman=Depends(get_current_user_role("salesman"))
+async def get_wallet_balance(
+    salesman=Depends(get_current_user_role_async("salesman"))
 ):
     return {"wallet_balance": salesman.wallet_balance}
 @router.get("/wallet/history", response_model=list[IncentiveOut])
-def get_wallet_history(
-    db: Session = Depends(get_db),
-    salesman=Depends(get_current_user_role("salesman"))
+async def get_wallet_history(
+    db: AsyncSession = Depends(get_async_db),
+    salesman=Depends(get_current_user_role_async("salesman"))
 ):
-    return db.query(Incentive).filter_by(
-        salesman_id=salesman.id,
-        is_visible=True
-    ).order_by(Incentive.timestamp.desc()).all()
+    result = await db.scalars(
+        select(Incentive)
+        .filter_by(salesman_id=salesman.id, is_visible=True)
+        .order_by(Incentive.timestamp.desc())
+    )
+    return result.all()
+
+
+@router.get("/wallet/ledger", response_model=list[WalletEntryOut])
+async def get_wallet_ledger(
+    limit: int = Query(100, ge=1, le=1000),
+    db: AsyncSession = Depends(get_async_db),
+    salesman=Depends(get_current_user_role_async("salesman"))
+):
+    """
+    Newest-first wallet statement: every credit and debit behind the balance.
+    """
+    return await db.run_sync(get_ledger, salesman.id, limit)
@@ -0,0 +1,172 @@
+import sys, os, random, statistics, tempfile, time
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Before/after query plans and timings for the hot-path indexes.
+# Runs against a throwaway database (BENCH_DATABASE_URL, default a temp
+# SQLite file) seeded with synthetic rows; never point it at real data.
+#
+#   python benchmark_indexes.py [scale]     # scale 1 = 100k sales (default)
+
+BENCH_DB = os.getenv("BENCH_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/bench.db"
+os.environ["DATABASE_URL"] = BENCH_DB
+
+from datetime import datetime, date, timedelta
+from sqlalchemy import select, func, text, insert, desc, event
+from db.database import Base, engine
+from models.salesman import Salesman
+from models.sale import Sale
+from models.incentive import Incentive
+from models.claim import Claim
+from models.streak import Streak
+from models.actual_sale import ActualSale
+from utils.date_range import day_bounds
+
+# Indexes added for the hot paths (declared in the model __table_args__)
+TABLES = [Sale.__table__, Incentive.__table__, Claim.__table__, Streak.__table__, ActualSale.__table__]
+INDEXES = [ix for table in TABLES for ix in table.indexes if ix.name in {
+    "ix_sales_salesman_id_timestamp",
+    "ix_sales_timestamp_id",
+    "ix_incentives_salesman_visible_timestamp",
+    "ix_incentives_salesman_barcode_trait",
+    "ix_incentives_salesman_claimed",
+    "ix_incentives_timestamp",
+    "ix_claims_salesman_status_timestamp",
+    "ix_claims_status_timestamp",
+    "ix_streaks_salesman_id_date",
+    "ix_actual_sales_match",
+}]
+
+SID = 7
+TODAY = date.today()
+MONTH_START = datetime.combine(TODAY.replace(day=1), datetime.min.time())
+DAY_START, DAY_END = day_bounds(TODAY)
+
+# Query shapes taken from crud/ and api/
+QUERIES = {
+    "my sales this month (salesman stats)":
+        select(Sale.id, Sale.amount).where(Sale.salesman_id == SID, Sale.timestamp >= MONTH_START),
+    "admin sales page (admin_sales_query)":
+        select(Sale.id, Sale.timestamp).where(Sale.timestamp >= MONTH_START)
+        .order_by(Sale.timestamp.desc(), Sale.id.desc()).limit(50),
+    "today's incentive, func.date() (old)":
+        select(func.sum(Incentive.amount)).where(
+            Incentive.salesman_id == SID, Incentive.is_visible == True,
+            func.date(Incentive.timestamp) == TODAY.isoformat()),
+    "today's incentive, range (new)":
+        select(func.sum(Incentive.amount)).where(
+            Incentive.salesman_id == SID, Incentive.is_visible == True,
+            Incentive.timestamp >= DAY_START, Incentive.timestamp < DAY_END),
+    "already rewarded check (generate_incentives)":
+        select(Incentive.id).where(
+            Incentive.salesman_id == SID, Incentive.barcode == "B00042", Incentive.trait == "old").limit(1),
+    "actual sale match (generate_incentives)":
+        select(ActualSale.id).where(
+            ActualSale.customer == "9000000042", ActualSale.barcode == "B00042",
+            ActualSale.qty == 1, ActualSale.net_amount == 100.0).limit(1),
+    "my pending claim (claim_router)":
+        select(Claim.id).where(Claim.salesman_id == SID, Claim.status == "pending")
+        .order_by(desc(Claim.timestamp)).limit(1),
+    "admin pending claims (claim_router)":
+        select(Claim.id).where(Claim.status == "pending").order_by(desc(Claim.timestamp)),
+    "streak history (streak_crud)":
+        select(Streak.id).where(Streak.salesman_id == SID).order_by(Streak.date.desc()),
+}
+
+
+def seed(scale: float):
+    rnd = random.Random(42)
+    n_salesmen, n_sales = 200, int(100_000 * scale)
+    now = datetime.utcnow()
+    stamp = lambda: now - timedelta(seconds=rnd.randint(0, 120 * 86400))
+
+    with engine.begin() as conn:
+        conn.execute(insert(Salesman), [
+            {"id": i, "name": f"s{i}", "mobile": f"{i:010d}", "outlet": f"O{i % 10}", "is_approved": True}
+            for i in range(1, n_salesmen + 1)
+        ])
+        conn.execute(insert(Sale), [
+            {"barcode": f"B{rnd.randint(0, 4999):05d}", "qty": rnd.randint(1, 3),
+             "customer_number": f"9{rnd.randint(0, 99999):09d}", "salesman_id": rnd.randint(1, n_salesmen),
+             "timestamp": stamp(), "amount": float(rnd.randint(1, 50) * 100)}
+            for _ in range(n_sales)
+        ])
+        conn.execute(insert(ActualSale), [
+            {"date": stamp(), "customer": f"9{rnd.randint(0, 99999):09d}", "barcode": f"B{rnd.randint(0, 4999):05d}",
+             "qty": rnd.randint(1, 3), "net_amount": float(rnd.randint(1, 50) * 100),
+             "salesman_id": rnd.randint(1, n_salesmen)}
+            for _ in range(n_sales)
+        ])
+        conn.execute(insert(Incentive), [
+            {"salesman_id": rnd.randint(1, n_salesmen), "barcode": f"B{rnd.randint(0, 4999):05d}",
+             "amount": float(rnd.randint(1, 500)), "trait": rnd.choice(["old", "new"]),
+             "is_visible": rnd.random() < 0.9, "claimed": False, "timestamp": stamp()}
+            for _ in range(n_sales)
+        ])
+        conn.execute(insert(Claim), [
+            {"salesman_id": rnd.randint(1, n_salesmen), "amount": float(rnd.randint(1, 500)),
+             "status": rnd.choice(["pending", "approved", "approved", "rejected", "paid"]), "timestamp": stamp()}
+            for _ in range(n_sales // 10)
+        ])
+        conn.execute(insert(Streak), [
+            {"salesman_id": rnd.randint(1, n_salesmen), "date": (now - timedelta(days=rnd.randint(0, 365))).date(),
+             "continued": True, "day_streak_count": 1}
+            for _ in range(n_sales // 4)
+        ])
+
+
+def explain(conn, stmt) -> str:
+    prefix = "EXPLAIN QUERY PLAN " if engine.dialect.name == "sqlite" else "EXPLAIN "
+
+    # Prefix the statement at the cursor so parameters are bound exactly as in the app
+    def add_prefix(conn_, cursor, statement, parameters, context, executemany):
+        return prefix + statement, parameters
+
+    event.listen(engine, "before_cursor_execute", add_prefix, retval=True)
+    try:
+        rows = conn.execute(stmt).cursor.fetchall()
+    finally:
+        event.remove(engine, "before_cursor_execute", add_prefix)
+    return " | ".join(str(r[-1]) for r in rows)
+
+
+def timed(conn, stmt, runs: int = 7) -> float:
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        conn.execute(stmt).fetchall()
+        samples.append(time.perf_counter() - start)
+    return statistics.median(samples) * 1000
+
+
+def measure(label: str) -> dict:
+    print(f"\n=== {label} ===")
+    results = {}
+    with engine.connect() as conn:
+        if engine.dialect.name == "sqlite":
+            conn.execute(text("ANALYZE"))
+        for name, stmt in QUERIES.items():
+            ms = timed(conn, stmt)
+            results[name] = ms
+            print(f"{ms:9.3f} ms  {name}\n             {explain(conn, stmt)}")
+    return results
+
+
+def run_benchmark(scale: float = 1.0):
+    Base.metadata.create_all(engine)
+    for index in INDEXES:
+        index.drop(engine, checkfirst=True)
+    print(f"Seeding {BENCH_DB} (scale {scale}) ...")
+    seed(scale)
+
+    before = measure("before: no hot-path indexes")
+    for index in INDEXES:
+        index.create(engine)
+    after = measure("after: " + ", ".join(ix.name for ix in INDEXES))
+
+    print("\n=== summary (median ms) ===")
+    for name in QUERIES:
+        print(f"{before[name]:9.3f} -> {after[name]:9.3f}  x{before[name] / max(after[name], 1e-6):7.1f}  {name}")
+
+
+if __name__ == "__main__":
+    run_benchmark(float(sys.argv[1]) if len(sys.argv) > 1 else 1.0)
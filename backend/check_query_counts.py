@@ -0,0 +1,81 @@
+import sys, os, tempfile
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Query-count regression check for the batched write paths. Runs the app
+# in-process against a throwaway database (CHECK_DATABASE_URL, default a
+# temp SQLite file) and compares the X-DB-Queries header of small and
+# large requests: a per-row query (N+1) shows up as a difference.
+# Exits non-zero if any budget is exceeded. Never point it at real data.
+#
+#   python check_query_counts.py
+
+CHECK_DB = os.getenv("CHECK_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/check.db"
+os.environ["DATABASE_URL"] = CHECK_DB
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+import logging
+from fastapi.testclient import TestClient
+import main
+logging.getLogger().setLevel(logging.WARNING)  # main.py logs at DEBUG
+from db.database import Base, engine, SessionLocal
+from models.salesman import Salesman
+from models.product import Product
+from models.trait_config import TraitConfig
+from utils.hash import hash_password
+
+BASKET_SIZE = 30
+failures = []
+
+
+def check(label: str, ok: bool, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label} {detail}")
+    if not ok:
+        failures.append(label)
+
+
+def seed():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add_all([
+        Salesman(name="check", mobile="9000000001", outlet="O1", verticle="v",
+                 password=hash_password("pw"), is_approved=True, wallet_balance=0.0),
+        TraitConfig(trait="new", percentage=10, is_visible=True),
+    ])
+    db.add_all([
+        Product(barcode=f"QC{i:04d}", verticle="v", rsp=10.0, trait="new")
+        for i in range(BASKET_SIZE)
+    ])
+    db.commit()
+    db.close()
+
+
+def queries(response) -> int:
+    response.raise_for_status()
+    return int(response.headers["X-DB-Queries"])
+
+
+def run_checks():
+    print(f"Database {CHECK_DB}")
+    seed()
+    with TestClient(main.app) as client:
+        r = client.post("/api/auth/login", json={"mobile": "9000000001", "password": "pw"})
+        r.raise_for_status()
+        headers = {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+        def basket(size: int):
+            items = [{"barcode": f"QC{i:04d}", "qty": 1} for i in range(size)]
+            return client.post("/api/sales/submit", headers=headers,
+                               json={"items": items, "customer_name": "c", "customer_number": "1"})
+
+        print(f"\nSale submission, 1 vs {BASKET_SIZE} items")
+        basket(BASKET_SIZE)  # warm the catalog cache for every barcode
+        one, many = queries(basket(1)), queries(basket(BASKET_SIZE))
+        check("basket size doesn't change the query count", one == many, f"1 item={one}, {BASKET_SIZE} items={many}")
+
+    print(f"\n{'✅ all checks passed' if not failures else f'❌ {len(failures)} checks failed'}")
+    return not failures
+
+
+if __name__ == "__main__":
+    sys.exit(0 if run_checks() else 1)
@@ -5,6 +5,25 @@ class Settings(BaseSettings):
     ALGORITHM: str = "HS256"
     DATABASE_URL: str
     master_admin_secret: str
+    UPLOAD_CHUNK_SIZE: int = 5000
+    JOB_WORKERS: int = 2
+    JOB_RESULT_DIR: str = ""
+    JOB_RESULT_TTL: int = 86400
+    JOB_HEARTBEAT_INTERVAL: int = 5
+    JOB_STALE_AFTER: int = 60
+    CATALOG_CACHE_SIZE: int = 50000
+    CATALOG_CACHE_TTL: int = 300
+    BARCODE_INDEX_REFRESH: int = 60
+    LEADERBOARD_CACHE_TTL: int = 30
+    LEADERBOARD_PUSH_DEBOUNCE: float = 1.0
+    RANK_INDEX_REFRESH: int = 300
+    PRINCIPAL_CACHE_SIZE: int = 10000
+    PRINCIPAL_CACHE_TTL: int = 60
+    AUTH_TOKEN_VERSION: bool = True
+    BCRYPT_ROUNDS: int = 12
+    IDEMPOTENCY_KEY_TTL: int = 86400
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_QUEUE: int = 256
     class Config:
         env_file = ".env"
 
@@ -1,7 +1,15 @@
+import numpy as np
+import pandas as pd
+from sqlalchemy import insert
 from sqlalchemy.orm import Session
+from config import settings
+from utils.spreadsheet import require_columns, iter_sheet_batches
 from models.actual_sale import ActualSale
 from schemas.actual_sale_schema import ActualSaleSubmit
 
+# Columns that make two actual sale rows exact duplicates
+ACTUAL_SALE_KEY = ["date", "customer", "barcode", "qty", "net_amount"]
+
 
 def submit_actual_sale(db: Session, payload: ActualSaleSubmit, salesman_id: int) -> ActualSale:
     """
@@ -41,3 +49,117 @@ def get_sales_by_salesman_id(db: Session, salesman_id: int) -> list[ActualSale]:
     Fetch all actual sales entered by a specific salesman.
     """
     return db.query(ActualSale).filter(ActualSale.salesman_id == salesman_id).all()
+
+
+def coerce_actual_sales(df: pd.DataFrame) -> tuple[pd.DataFrame, int]:
+    """
+    Convert an uploaded sheet (date, customer, barcode, qty, net amount) into
+    typed ActualSale columns. Rows that fail to parse are dropped and counted.
+    """
+    frame = pd.DataFrame({
+        "date": pd.to_datetime(df["date"], errors="coerce", format="mixed"),
+        "customer": df["customer"].astype(str),
+        "barcode": df["barcode"].astype(str),
+        "qty": pd.to_numeric(df["qty"], errors="coerce"),
+        "net_amount": pd.to_numeric(df["net amount"], errors="coerce"),
+    }).replace([np.inf, -np.inf], np.nan)
+
+    valid = frame.notna().all(axis=1)
+    frame = frame[valid].astype({"qty": int, "net_amount": float})
+    return frame, int((~valid).sum())
+
+
+def _existing_keys(db: Session, chunk: pd.DataFrame) -> pd.DataFrame:
+    """
+    One keyed lookup of stored actual sales that could collide with this chunk.
+    """
+    rows = (
+        db.query(
+            ActualSale.date,
+            ActualSale.customer,
+            ActualSale.barcode,
+            ActualSale.qty,
+            ActualSale.net_amount
+        )
+        .filter(
+            ActualSale.barcode.in_(chunk["barcode"].unique().tolist()),
+            ActualSale.date.between(chunk["date"].min().to_pydatetime(), chunk["date"].max().to_pydatetime())
+        )
+        .all()
+    )
+    return pd.DataFrame(rows, columns=ACTUAL_SALE_KEY).drop_duplicates()
+
+
+def bulk_insert_actual_sales(db: Session, frame: pd.DataFrame, chunk_size: int = None) -> dict:
+    """
+    Insert coerced actual sales in chunks, skipping rows duplicated within the
+    frame or already stored. The caller commits.
+    Returns inserted/skipped counts and the dates of skipped duplicates.
+    """
+    chunk_size = chunk_size or settings.UPLOAD_CHUNK_SIZE
+    inserted = 0
+    skipped_dates = set()
+
+    in_file_dupes = frame.duplicated(subset=ACTUAL_SALE_KEY)
+    skipped_dates.update(frame.loc[in_file_dupes, "date"].dt.strftime("%Y-%m-%d"))
+    frame = frame[~in_file_dupes]
+    skipped = int(in_file_dupes.sum())
+
+    for start in range(0, len(frame), chunk_size):
+        chunk = frame.iloc[start:start + chunk_size]
+
+        existing = _existing_keys(db, chunk)
+        if not existing.empty:
+            merged = chunk.merge(existing, on=ACTUAL_SALE_KEY, how="left", indicator=True)
+            is_dupe = (merged["_merge"] == "both").to_numpy()
+            skipped += int(is_dupe.sum())
+            skipped_dates.update(chunk.loc[is_dupe, "date"].dt.strftime("%Y-%m-%d"))
+            chunk = chunk[~is_dupe]
+
+        if not chunk.empty:
+            db.execute(insert(ActualSale), chunk.to_dict("records"))
+            inserted += len(chunk)
+
+    return {
+        "inserted": inserted,
+        "skipped": skipped,
+        "skipped_dates": skipped_dates
+    }
+
+
+SALES_FILE_COLUMNS = "date, customer, barcode, qty, net amount"
+
+
+def import_actual_sales_file(db: Session, path: str, progress=None) -> dict:
+    """
+    Stream an .xlsx/.csv sales file from disk into actual_sales batch by batch
+    and commit once at the end. Returns the upload summary.
+    """
+    require_columns(path, {"date", "customer", "barcode", "qty", "net amount"}, SALES_FILE_COLUMNS)
+
+    inserted = 0
+    skipped = 0
+    skipped_dates = set()
+
+    try:
+        # Each parsed batch is written before the next one is read
+        for batch in iter_sheet_batches(path, settings.UPLOAD_CHUNK_SIZE):
+            sales, invalid = coerce_actual_sales(batch)
+            result = bulk_insert_actual_sales(db, sales)
+            inserted += result["inserted"]
+            skipped += result["skipped"] + invalid
+            skipped_dates.update(result["skipped_dates"])
+            if progress:
+                progress(inserted + skipped)
+
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+
+    return {
+        "message": "Sales file processed.",
+        "inserted": inserted,
+        "skipped": skipped,
+        "skipped_dates": sorted(list(skipped_dates))
+    }
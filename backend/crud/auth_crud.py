@@ -0,0 +1,43 @@
+from sqlalchemy import literal, select, update
+from sqlalchemy.orm import Session
+from models.admin import Admin
+from models.salesman import Salesman
+
+
+def get_login_account(db: Session, mobile: str):
+    """
+    Admin or salesman registered with `mobile`, in one query.
+    Row has role, id, mobile, password_hash, is_approved, token_version;
+    an admin wins if the number is in both tables. None if unknown.
+    """
+    admins = select(
+        literal("admin").label("role"),
+        Admin.id,
+        Admin.mobile,
+        Admin.hashed_password.label("password_hash"),
+        literal(True).label("is_approved"),
+        Admin.token_version,
+    ).where(Admin.mobile == mobile)
+    salesmen = select(
+        literal("salesman").label("role"),
+        Salesman.id,
+        Salesman.mobile,
+        Salesman.password.label("password_hash"),
+        Salesman.is_approved,
+        Salesman.token_version,
+    ).where(Salesman.mobile == mobile)
+
+    rows = db.execute(admins.union_all(salesmen)).all()
+    return min(rows, key=lambda row: row.role != "admin", default=None)
+
+
+def update_password_hash(db: Session, role: str, account_id: int, password_hash: str) -> None:
+    """
+    Store a rehashed password (same password, new cost factor).
+    """
+    if role == "admin":
+        stmt = update(Admin).where(Admin.id == account_id).values(hashed_password=password_hash)
+    else:
+        stmt = update(Salesman).where(Salesman.id == account_id).values(password=password_hash)
+    db.execute(stmt)
+    db.commit()
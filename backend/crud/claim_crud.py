@@ -1,3 +1,7 @@
+from collections import defaultdict
+from itertools import islice
+from sqlalchemy import update, select, case, cast, func, String
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 from models.claim import Claim
 from models.incentive import Incentive
@@ -5,20 +9,23 @@ from models.salesman import Salesman
 from typing import Optional, List
 from fastapi import HTTPException
 from datetime import datetime
+from services.rank_index import rank_index
+from utils.pagination import after_cursor
+from services.principal_cache import invalidate_salesmen
+from crud.wallet_crud import post_entries, hold_for_claim, REFUND
+from crud.rollup_crud import add_to_rollup, utc_today
+from crud.idempotency_crud import request_hash, find_idempotency_key, add_idempotency_key
 
-def submit_claim(db: Session, salesman_id: int, amount: float, remarks: Optional[str] = None) -> Optional[Claim]:
+CLAIM_SCOPE = "claim"
+
+
+def submit_claim(db: Session, salesman_id: int, amount: float, remarks: Optional[str] = None, idempotency=None) -> Optional[Claim]:
     """
     Create a claim (withdrawal request) for a specified amount.
-    Deducts immediately from wallet_balance to prevent duplicate claims.
+    Holds the amount from wallet_balance immediately to prevent duplicate claims.
+    `idempotency` is an IdempotencyKey claimed in this transaction; it is
+    committed together with the claim.
     """
-    salesman = db.query(Salesman).filter_by(id=salesman_id).first()
-
-    if not salesman or salesman.wallet_balance < amount:
-        return None
-
-    # ✅ Deduct wallet now
-    salesman.wallet_balance -= amount
-
     claim = Claim(
         salesman_id=salesman_id,
         amount=amount,
@@ -28,19 +35,109 @@ def submit_claim(db: Session, salesman_id: int, amount: float, remarks: Optional
 
     try:
         db.add(claim)
+        db.flush()
+        # ✅ Deduct wallet now, only if the balance covers it (atomic check-and-debit)
+        if not hold_for_claim(db, salesman_id, amount, claim.id):
+            db.rollback()
+            return None
+        if idempotency is not None:
+            idempotency.resource_id = claim.id
         db.commit()
         db.refresh(claim)
     except Exception as e:
         db.rollback()
         raise e
 
+    invalidate_salesmen([salesman_id])
     return claim
 
 
+def submit_claim_once(db: Session, salesman_id: int, amount: float, remarks: Optional[str], key: str) -> tuple[Optional[Claim], bool]:
+    """
+    submit_claim() guarded by an Idempotency-Key. Returns (claim, replayed):
+    a retry with the same key and body gets the claim the first request
+    created instead of a second one.
+    """
+    owner = f"salesman:{salesman_id}"
+    body_hash = request_hash({"amount": amount, "remarks": remarks})
+
+    record = find_idempotency_key(db, CLAIM_SCOPE, owner, key, body_hash)
+    if record is None:
+        try:
+            record = add_idempotency_key(db, CLAIM_SCOPE, owner, key, body_hash)
+        except IntegrityError:
+            # A concurrent request with this key committed first
+            db.rollback()
+            record = find_idempotency_key(db, CLAIM_SCOPE, owner, key, body_hash)
+            if record is None:
+                raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is in progress")
+        else:
+            return submit_claim(db, salesman_id, amount, remarks, idempotency=record), False
+
+    return get_claim_by_id(db, record.resource_id), True
+
+
+def _close_claim(db: Session, claim_id: int, status: str, **values) -> bool:
+    """
+    Move a claim out of "pending" with a conditional UPDATE. False if it is
+    no longer pending, e.g. another admin approved or rejected it first.
+    """
+    closed = db.execute(
+        update(Claim)
+        .where(Claim.id == claim_id, Claim.status == "pending")
+        .values(status=status, updated_at=datetime.utcnow(), **values)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    return closed == 1
+
+
 def get_all_claims(db: Session) -> List[Claim]:
     return db.query(Claim).order_by(Claim.timestamp.desc()).all()
 
 
+def claims_query(
+    db: Session,
+    status: Optional[str] = None,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    salesman_id: Optional[int] = None,
+    outlet: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Claims joined to their salesman's name, newest first, with every filter
+    applied in SQL. `cursor` continues after a previous page.
+    """
+    query = (
+        db.query(
+            Claim.id,
+            Claim.salesman_id,
+            Claim.amount,
+            Claim.status,
+            Claim.remarks,
+            Claim.tx_hash,
+            Claim.timestamp,
+            func.coalesce(Salesman.name, "#ID " + cast(Claim.salesman_id, String)).label("salesman_name")
+        )
+        .outerjoin(Salesman, Salesman.id == Claim.salesman_id)
+    )
+
+    if status:
+        query = query.filter(Claim.status == status)
+    if from_date:
+        query = query.filter(Claim.timestamp >= from_date)
+    if to_date:
+        query = query.filter(Claim.timestamp <= to_date)
+    if salesman_id is not None:
+        query = query.filter(Claim.salesman_id == salesman_id)
+    if outlet:
+        query = query.filter(Salesman.outlet == outlet)
+    if cursor:
+        query = query.filter(after_cursor(Claim.timestamp, Claim.id, cursor))
+
+    return query.order_by(Claim.timestamp.desc(), Claim.id.desc())
+
+
 def get_claim_by_id(db: Session, claim_id: int) -> Claim:
     claim = db.query(Claim).filter_by(id=claim_id).first()
     if not claim:
@@ -65,9 +162,9 @@ def approve_claim_by_id(db: Session, claim_id: int, tx_hash: Optional[str] = Non
 
     # ✅ No wallet logic here
 
-    claim.status = "approved"
-    claim.tx_hash = tx_hash
-    claim.updated_at = datetime.utcnow()
+    if not _close_claim(db, claim.id, "approved", tx_hash=tx_hash):
+        db.rollback()
+        raise HTTPException(status_code=400, detail="Claim is not pending")
 
     try:
         db.commit()
@@ -88,13 +185,13 @@ def reject_claim_by_id(db: Session, claim_id: int, reason: Optional[str] = None)
     if not salesman:
         raise HTTPException(status_code=404, detail="Salesman not found")
 
-    # ✅ Refund to wallet
-    salesman.wallet_balance += claim.amount
+    # Only the request that actually closes the claim refunds it
+    if not _close_claim(db, claim.id, "rejected", **({"remarks": reason} if reason else {})):
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Pending claim not found")
 
-    claim.status = "rejected"
-    if reason:
-        claim.remarks = reason
-    claim.updated_at = datetime.utcnow()
+    # ✅ Refund to wallet
+    post_entries(db, [{"salesman_id": salesman.id, "type": REFUND, "amount": claim.amount, "claim_id": claim.id}])
 
     try:
         db.commit()
@@ -102,6 +199,7 @@ def reject_claim_by_id(db: Session, claim_id: int, reason: Optional[str] = None)
         db.rollback()
         raise e
 
+    invalidate_salesmen([salesman.id])
     return {"message": "Claim rejected and amount refunded", "id": claim.id}
 
 
@@ -114,8 +212,14 @@ def amend_and_approve_claim(db: Session, claim_id: int, new_amount: float, new_r
     if not salesman:
         raise HTTPException(status_code=404, detail="Salesman not found")
 
+    if not _close_claim(db, claim.id, "approved", amount=new_amount, remarks=new_remarks):
+        db.rollback()
+        raise HTTPException(status_code=404, detail="Claim not found")
+
     # ✅ Reclaim extra incentives if amount is reduced
     diff = claim.amount - new_amount
+    visible_reclaimed = 0.0
+    rollup_deltas = defaultdict(lambda: {"incentive": 0.0})
     if diff > 0:
         incentives = (
             db.query(Incentive)
@@ -126,25 +230,144 @@ def amend_and_approve_claim(db: Session, claim_id: int, new_amount: float, new_r
         for incentive in incentives:
             if diff <= 0:
                 break
-            if incentive.amount <= diff:
-                diff -= incentive.amount
-                incentive.amount = 0
-            else:
-                incentive.amount -= diff
-                diff = 0
-
-    claim.amount = new_amount
-    claim.status = "approved"
-    claim.remarks = new_remarks
-    claim.updated_at = datetime.utcnow()
+            taken = min(incentive.amount, diff)
+            incentive.amount -= taken
+            diff -= taken
+            if incentive.is_visible:
+                visible_reclaimed += taken
+            day = incentive.timestamp.date() if incentive.timestamp else utc_today()
+            rollup_deltas[(salesman.id, day)]["incentive"] -= taken
+
+    # 📊 Keep the daily rollup in step with the reduced incentives
+    add_to_rollup(db, rollup_deltas)
 
     # ✅ Do NOT recompute wallet
 
     try:
-        db.commit()
+        with rank_index.committing() as seq:
+            db.commit()
         db.refresh(claim)
     except Exception as e:
         db.rollback()
         raise HTTPException(status_code=500, detail="Database error during amend+approve")
 
+    if visible_reclaimed:
+        rank_index.apply({salesman.id: (-visible_reclaimed, 0)}, seq)
     return claim
+
+
+# Claim ids per statement in bulk actions (keeps IN lists and CASEs bounded)
+BULK_CHUNK_SIZE = 1000
+
+
+def _chunks(ids: list[int], size: int = BULK_CHUNK_SIZE):
+    ids = iter(ids)
+    while chunk := list(islice(ids, size)):
+        yield chunk
+
+
+def _failure_reasons(db: Session, ids: list[int]) -> dict:
+    """
+    Why claims that a bulk UPDATE skipped could not be closed.
+    """
+    if not ids:
+        return {}
+    reasons = {claim_id: "not_found" for claim_id in ids}
+    for chunk in _chunks(ids):
+        rows = db.execute(
+            select(Claim.id, Claim.status, Claim.amount, Salesman.id.label("salesman_found"))
+            .outerjoin(Salesman, Salesman.id == Claim.salesman_id)
+            .where(Claim.id.in_(chunk))
+        ).all()
+        for row in rows:
+            if row.status != "pending":
+                reasons[row.id] = "not_pending"
+            elif row.salesman_found is None:
+                reasons[row.id] = "salesman_not_found"
+            elif row.amount is None:
+                reasons[row.id] = "amount_missing"
+    return reasons
+
+
+def _bulk_close(db: Session, ids: list[int], status: str, **values) -> list:
+    """
+    Close every still-pending, valid claim in `ids` with one UPDATE ...
+    RETURNING per chunk. Returns (id, salesman_id, amount) of those closed.
+    """
+    closed = []
+    now = datetime.utcnow()
+    for chunk in _chunks(ids):
+        chunk_values = {
+            key: value(chunk) if callable(value) else value for key, value in values.items()
+        }
+        closed += db.execute(
+            update(Claim)
+            .where(
+                Claim.id.in_(chunk),
+                Claim.status == "pending",
+                Claim.amount.isnot(None),
+                Claim.salesman_id.in_(select(Salesman.id)),
+            )
+            .values(status=status, updated_at=now, **chunk_values)
+            .returning(Claim.id, Claim.salesman_id, Claim.amount)
+            .execution_options(synchronize_session=False)
+        ).all()
+    return closed
+
+
+def _skipped(ids: list[int], closed: list) -> list[int]:
+    closed_ids = {row.id for row in closed}
+    return [claim_id for claim_id in ids if claim_id not in closed_ids]
+
+
+def _bulk_results(ids: list[int], closed: list, status: str, reasons: dict) -> list[dict]:
+    closed_ids = {row.id for row in closed}
+    return [
+        {"id": claim_id, "status": status if claim_id in closed_ids else "failed", "reason": reasons.get(claim_id)}
+        for claim_id in ids
+    ]
+
+
+def bulk_approve_claims(db: Session, tx_hashes: dict) -> list[dict]:
+    """
+    Approve many claims in one transaction. `tx_hashes` maps claim id ->
+    tx hash (or None). Returns a result per id, in request order; claims
+    that can't be approved are reported and left untouched.
+    """
+    ids = list(tx_hashes)
+    hashes = {claim_id: tx for claim_id, tx in tx_hashes.items() if tx is not None}
+
+    def tx_hash_for(chunk):
+        mapping = {claim_id: hashes[claim_id] for claim_id in chunk if claim_id in hashes}
+        return case(mapping, value=Claim.id, else_=Claim.tx_hash) if mapping else Claim.tx_hash
+
+    try:
+        closed = _bulk_close(db, ids, "approved", tx_hash=tx_hash_for)
+        reasons = _failure_reasons(db, _skipped(ids, closed))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    return _bulk_results(ids, closed, "approved", reasons)
+
+
+def bulk_reject_claims(db: Session, ids: list[int], reason: Optional[str] = None) -> list[dict]:
+    """
+    Reject many claims in one transaction and refund them: one ledger entry
+    per claim, one balance update per salesman.
+    """
+    values = {"remarks": reason} if reason else {}
+    try:
+        closed = _bulk_close(db, ids, "rejected", **values)
+        post_entries(db, [
+            {"salesman_id": row.salesman_id, "type": REFUND, "amount": row.amount, "claim_id": row.id}
+            for row in closed
+        ])
+        reasons = _failure_reasons(db, _skipped(ids, closed))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    invalidate_salesmen({row.salesman_id for row in closed})
+    return _bulk_results(ids, closed, "rejected", reasons)
+
@@ -0,0 +1,55 @@
+import hashlib
+import json
+from datetime import datetime, timedelta
+from fastapi import HTTPException
+from sqlalchemy import delete
+from sqlalchemy.orm import Session
+from config import settings
+from models.idempotency_key import IdempotencyKey
+
+
+def request_hash(body: dict) -> str:
+    return hashlib.sha256(json.dumps(body, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+
+def find_idempotency_key(db: Session, scope: str, owner: str, key: str, body_hash: str) -> IdempotencyKey | None:
+    """
+    The live record of an earlier request with this key, if any.
+    A key reused with a different request body is rejected with 422.
+    """
+    record = db.get(IdempotencyKey, (scope, owner, key))
+    if record is None:
+        return None
+    if record.expires_at < datetime.utcnow():
+        db.delete(record)
+        db.flush()
+        return None
+    if record.request_hash != body_hash:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+    return record
+
+
+def add_idempotency_key(db: Session, scope: str, owner: str, key: str, body_hash: str) -> IdempotencyKey:
+    """
+    Claim the key inside the caller's transaction. The flush raises
+    IntegrityError if a concurrent request holds the same key; on Postgres
+    it first waits for that request's transaction to finish.
+    """
+    now = datetime.utcnow()
+    # Opportunistic cleanup of this owner's expired keys (indexed, usually nothing)
+    db.execute(delete(IdempotencyKey).where(
+        IdempotencyKey.scope == scope, IdempotencyKey.owner == owner, IdempotencyKey.expires_at < now
+    ))
+    record = IdempotencyKey(
+        scope=scope, owner=owner, key=key, request_hash=body_hash,
+        created_at=now, expires_at=now + timedelta(seconds=settings.IDEMPOTENCY_KEY_TTL)
+    )
+    db.add(record)
+    db.flush()
+    return record
+
+
+def purge_expired_idempotency_keys(db: Session) -> int:
+    deleted = db.execute(delete(IdempotencyKey).where(IdempotencyKey.expires_at < datetime.utcnow())).rowcount
+    db.commit()
+    return deleted
@@ -5,77 +5,206 @@ from models.product import Product
 from models.incentive import Incentive
 from models.trait_config import TraitConfig
 from models.salesman import Salesman
+from models.incentive_watermark import IncentiveWatermark
+from models.pending_match import PendingMatch, NO_ACTUAL_SALE, NOT_PAYABLE
+from crud.rollup_crud import rollup_incentives
+from crud.wallet_crud import post_entries, INCENTIVE
+from utils.date_range import day_bounds
+from services.rank_index import rank_index, record_incentives
+from services.principal_cache import invalidate_salesmen
 from datetime import datetime, timedelta
-from sqlalchemy import func
+from collections import defaultdict
+from sqlalchemy import func, and_, exists, select, insert, delete, update, case, literal
 
-def generate_incentives(db: Session) -> dict:
+
+def _actual_sale_match():
+    """
+    Join condition between a Sale and the ActualSale that confirms it.
+    """
+    return and_(
+        ActualSale.customer == Sale.customer_number,
+        ActualSale.barcode == Sale.barcode,
+        ActualSale.qty == Sale.qty,
+        ActualSale.net_amount == Sale.amount
+    )
+
+
+def _payable_match(*actual_criteria):
+    """
+    EXISTS an actual sale confirming Sale whose product has a paying trait.
+    """
+    return (
+        select(ActualSale.id)
+        .join(Product, Product.barcode == Sale.barcode)
+        .join(TraitConfig, TraitConfig.trait == Product.trait)
+        .where(_actual_sale_match(), TraitConfig.percentage > 0, *actual_criteria)
+        .exists()
+    )
+
+
+def _any_match(*actual_criteria):
+    return select(ActualSale.id).where(_actual_sale_match(), *actual_criteria).exists()
+
+
+def _matched_sales(db: Session, *criteria):
+    """
+    Sales joined to their actual sale, product and a paying trait config,
+    flagged when the (salesman_id, barcode, trait) key is already rewarded.
+    """
+    already_rewarded = exists().where(
+        Incentive.salesman_id == Sale.salesman_id,
+        Incentive.barcode == Sale.barcode,
+        Incentive.trait == Product.trait
+    )
+    return (
+        db.query(
+            Sale.id,
+            Sale.salesman_id,
+            Sale.barcode,
+            Product.trait,
+            ActualSale.net_amount,
+            TraitConfig.percentage,
+            TraitConfig.is_visible,
+            already_rewarded.label("already_rewarded")
+        )
+        .join(ActualSale, _actual_sale_match())
+        .join(Product, Product.barcode == Sale.barcode)
+        .join(TraitConfig, TraitConfig.trait == Product.trait)
+        .filter(TraitConfig.percentage > 0, *criteria)
+        .order_by(Sale.id, ActualSale.id)
+    )
+
+
+def get_watermark(db: Session) -> IncentiveWatermark:
+    watermark = db.query(IncentiveWatermark).first()
+    if not watermark:
+        watermark = IncentiveWatermark(last_sale_id=0, last_actual_sale_id=0)
+        db.add(watermark)
+        db.flush()
+    return watermark
+
+
+def generate_incentives(db: Session, full_rescan: bool = False) -> dict:
     """
     Match sales with actual sales and calculate incentives based on product traits.
     Avoids duplicates using (salesman_id, barcode, trait) as unique key.
     Also adds the incentive amount to salesman's wallet_balance.
+
+    Incremental: only sales newer than the watermark are matched. Sales that
+    can't be paid yet go to the pending queue: those without an actual sale
+    are re-matched only against actual sales that arrived after the previous
+    run; confirmed sales whose product or trait didn't pay are re-checked
+    every run, so fixing the catalog or trait config pays them.
+    full_rescan=True resets the watermark and queue and reprocesses everything.
     """
-    sales = db.query(Sale).all()
-    created = 0
+    new_incentives = []
+    credits = defaultdict(float)
+    seen_sales = set()
+    seen_keys = set()
     skipped = 0
 
     try:
-        for sale in sales:
-            match = db.query(ActualSale).filter_by(
-                customer=sale.customer_number,
-                barcode=sale.barcode,
-                qty=sale.qty,
-                net_amount=sale.net_amount
-            ).first()
-            if not match:
-                continue
-
-            product = db.query(Product).filter_by(barcode=sale.barcode).first()
-            if not product:
-                continue
-
-            trait_config = db.query(TraitConfig).filter_by(trait=product.trait).first()
-            if not trait_config or not trait_config.percentage or trait_config.percentage <= 0:
-                continue
-
-            existing = db.query(Incentive).filter_by(
-                salesman_id=sale.salesman_id,
-                barcode=sale.barcode,
-                trait=product.trait
-            ).first()
-            if existing:
-                skipped += 1
-                continue
-
-            earned = match.net_amount * trait_config.percentage
-
-            # Create new incentive
-            incentive = Incentive(
-                salesman_id=sale.salesman_id,
-                barcode=sale.barcode,
-                amount=earned,
-                trait=product.trait,
-                is_visible=trait_config.is_visible
-            )
+        watermark = get_watermark(db)
+        if full_rescan:
+            db.query(PendingMatch).delete(synchronize_session=False)
+            watermark.last_sale_id = 0
+            watermark.last_actual_sale_id = 0
 
-            db.add(incentive)
+        last_sale_id = watermark.last_sale_id or 0
+        last_actual_id = watermark.last_actual_sale_id or 0
+        # Freeze the window so rows arriving mid-run wait for the next one
+        max_sale_id = db.query(func.max(Sale.id)).scalar() or last_sale_id
+        max_actual_id = db.query(func.max(ActualSale.id)).scalar() or last_actual_id
 
-            # ✅ Update wallet balance
-            salesman = db.query(Salesman).filter_by(id=sale.salesman_id).first()
-            if salesman:
-                salesman.wallet_balance += earned
+        new_sales = (Sale.id > last_sale_id, Sale.id <= max_sale_id)
+        new_actuals = (ActualSale.id > last_actual_id, ActualSale.id <= max_actual_id)
+        known_actuals = (ActualSale.id <= max_actual_id,)
 
-            created += 1
+        def pending_ids(reason):
+            return select(PendingMatch.sale_id).where(PendingMatch.reason == reason)
+
+        streams = (
+            # Older unmatched sales, only against newly uploaded actual sales
+            _matched_sales(db, Sale.id.in_(pending_ids(NO_ACTUAL_SALE)), *new_actuals),
+            _matched_sales(db, *new_sales, *known_actuals),
+            # Confirmed sales that didn't pay before; the catalog may have changed
+            _matched_sales(db, Sale.id.in_(pending_ids(NOT_PAYABLE)), *known_actuals),
+        )
+        for matches in streams:
+            for row in matches.yield_per(5000):
+                # First actual-sale match wins, as with the old per-sale .first()
+                if row.id in seen_sales:
+                    continue
+                seen_sales.add(row.id)
+
+                key = (row.salesman_id, row.barcode, row.trait)
+                if row.already_rewarded or key in seen_keys:
+                    skipped += 1
+                    continue
+                seen_keys.add(key)
+
+                earned = row.net_amount * row.percentage
+                new_incentives.append({
+                    "salesman_id": row.salesman_id,
+                    "barcode": row.barcode,
+                    "amount": earned,
+                    "trait": row.trait,
+                    "is_visible": row.is_visible
+                })
+                credits[row.salesman_id] += earned
+
+        if new_incentives:
+            db.execute(insert(Incentive), new_incentives)
+            post_entries(db, [
+                {"salesman_id": sid, "type": INCENTIVE, "amount": credit, "source": "actual_sales"}
+                for sid, credit in credits.items()
+            ])
+            rollup_incentives(db, new_incentives)
+
+        def pending_sale(*criteria):
+            return select(Sale.id).where(Sale.id == PendingMatch.sale_id, *criteria).exists()
+
+        # Dequeue pending sales handled above (paid, or already rewarded)
+        db.execute(delete(PendingMatch).where(
+            PendingMatch.reason == NO_ACTUAL_SALE, pending_sale(_payable_match(*new_actuals))
+        ))
+        db.execute(delete(PendingMatch).where(
+            PendingMatch.reason == NOT_PAYABLE, pending_sale(_payable_match(*known_actuals))
+        ))
+        # Newly confirmed but not payable: keep them for the catalog re-check
+        db.execute(
+            update(PendingMatch)
+            .where(PendingMatch.reason == NO_ACTUAL_SALE, pending_sale(_any_match(*new_actuals)))
+            .values(reason=NOT_PAYABLE)
+            .execution_options(synchronize_session=False)
+        )
+        # Queue new sales that couldn't be paid
+        db.execute(
+            insert(PendingMatch).from_select(
+                ["sale_id", "reason"],
+                select(
+                    Sale.id,
+                    case((_any_match(*known_actuals), literal(NOT_PAYABLE)), else_=literal(NO_ACTUAL_SALE))
+                ).where(*new_sales, ~_payable_match(*known_actuals))
+            )
+        )
 
-        if created > 0:
+        watermark.last_sale_id = max_sale_id
+        watermark.last_actual_sale_id = max_actual_id
+        watermark.updated_at = datetime.utcnow()
+        with rank_index.committing() as seq:
             db.commit()
+        record_incentives(new_incentives, seq)
+        invalidate_salesmen(credits)
 
     except Exception as e:
         db.rollback()
         raise e
 
     return {
-        "created": created,
-        "skipped_duplicates": skipped
+        "created": len(new_incentives),
+        "skipped_duplicates": skipped,
+        "pending_matches": db.query(func.count(PendingMatch.sale_id)).scalar()
     }
 
 
@@ -100,7 +229,8 @@ def get_all_incentives(db: Session, period: str = "total"):
     today = datetime.now().date()
 
     if period == "today":
-        query = query.filter(func.date(Incentive.timestamp) == today)
+        day_start, day_end = day_bounds(today)
+        query = query.filter(Incentive.timestamp >= day_start, Incentive.timestamp < day_end)
     elif period == "month":
         query = query.filter(
             Incentive.timestamp >= today.replace(day=1)
@@ -111,7 +241,7 @@ def get_all_incentives(db: Session, period: str = "total"):
         last_month_start = last_month_end.replace(day=1)
         query = query.filter(
             Incentive.timestamp >= last_month_start,
-            Incentive.timestamp <= last_month_end
+            Incentive.timestamp < first_day_this_month
         )
 
     return [
@@ -136,7 +266,12 @@ def toggle_incentive_visibility(db: Session, incentive_id: int, is_visible: bool
     incentive = db.query(Incentive).filter_by(id=incentive_id).first()
     if not incentive:
         raise ValueError("Incentive not found")
+    was_visible = incentive.is_visible
     incentive.is_visible = is_visible
-    db.commit()
+    with rank_index.committing() as seq:
+        db.commit()
     db.refresh(incentive)
+    if bool(was_visible) != bool(is_visible):
+        change = incentive.amount or 0.0
+        rank_index.apply({incentive.salesman_id: (change, 1) if is_visible else (-change, -1)}, seq)
     return incentive
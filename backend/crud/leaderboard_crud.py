@@ -2,7 +2,9 @@ from sqlalchemy.orm import Session
 from sqlalchemy import func
 from datetime import date, timedelta, timezone, datetime
 
-from models.sale import Sale
+from crud.rollup_crud import top_sales, in_days
+from utils.date_range import get_week_range_and_label, get_month_range
+from models.daily_sales_rollup import DailySalesRollup
 from models.salesman import Salesman
 from models.streak import Streak
 
@@ -12,33 +14,56 @@ def calculate_leaderboard(db: Session, period: str = "day"):
     Reusable leaderboard function used by /day, /week, /month.
     Returns top 10 salesmen with total sales amount.
     """
-    now = datetime.now(timezone.utc)
+    today = datetime.now(timezone.utc).date()
 
     if period == "day":
-        # Start and end of current UTC day
-        start_date = datetime.combine(now.date(), datetime.min.time(), tzinfo=timezone.utc)
-        end_date = datetime.combine(now.date(), datetime.max.time(), tzinfo=timezone.utc)
-        timestamp_filter = (Sale.timestamp >= start_date) & (Sale.timestamp <= end_date)
+        start_date = today
     elif period == "week":
-        start_date = now - timedelta(days=7)
-        timestamp_filter = Sale.timestamp >= start_date
+        start_date = today - timedelta(days=7)
     elif period == "month":
-        start_date = now.replace(day=1)
-        timestamp_filter = Sale.timestamp >= start_date
+        start_date = today.replace(day=1)
     else:
         raise ValueError("Invalid period")
 
+    # Read from the daily rollup rather than raw sales
+    results = top_sales(db, start_date, today, limit=10)
+
+    return [{"name": r.name, "sales": float(r.total or 0)} for r in results]
+
+
+def sales_by_name(db: Session, start: date, end: date):
+    """
+    Sales per salesman name over [start, end] from the daily rollup, highest first.
+    """
+    total = func.sum(DailySalesRollup.amount)
     results = (
-        db.query(Salesman.name, func.sum(Sale.amount).label("total_sales"))
-        .join(Sale, Salesman.id == Sale.salesman_id)
-        .filter(timestamp_filter)
-        .group_by(Salesman.id)
-        .order_by(func.sum(Sale.amount).desc())
-        .limit(10)
+        db.query(Salesman.name, total.label("sales"))
+        .join(DailySalesRollup, DailySalesRollup.salesman_id == Salesman.id)
+        .filter(*in_days(start, end))
+        .group_by(Salesman.name)
+        .order_by(total.desc())
         .all()
     )
+    return [{"name": r.name, "sales": r.sales} for r in results]
+
+
+def leaderboard_payload(db: Session, board: str):
+    """
+    Response body of a public leaderboard endpoint: "day", "week", "month" or "streak".
+    """
+    if board == "day":
+        return calculate_leaderboard(db, period="day")
+    if board == "streak":
+        return get_streak_leaderboard(db)
 
-    return [{"name": r.name, "sales": float(r.total_sales or 0)} for r in results]
+    today = date.today()
+    if board == "week":
+        start, end, label = get_week_range_and_label(today)
+    elif board == "month":
+        start, end, label = get_month_range(today)
+    else:
+        raise ValueError("Invalid leaderboard")
+    return {"label": label, "data": sales_by_name(db, start, end)}
 
 
 def get_leaderboard(db: Session, scope: str):
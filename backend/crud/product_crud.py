@@ -3,7 +3,11 @@ from sqlalchemy.orm import Session
 from models.product import Product
 from models.verticle import Verticle
 from schemas.product_schema import ProductSubmit
-from sqlalchemy import func
+from sqlalchemy import func, insert, update
+from config import settings
+from utils.spreadsheet import require_columns, sheet_columns, iter_sheet_batches
+from services.catalog_cache import invalidate_products
+from services.barcode_index import barcode_index
 
 
 def get_or_create_verticle(db: Session, name: str) -> Verticle:
@@ -41,6 +45,8 @@ def upsert_product(db: Session, payload: ProductSubmit) -> Product:
             db.add(new)
 
         db.commit()
+        invalidate_products()
+        barcode_index.add([payload.barcode.strip()])
         return existing or new
 
     except Exception as e:
@@ -48,64 +54,199 @@ def upsert_product(db: Session, payload: ProductSubmit) -> Product:
         raise e
 
 
-def upsert_products_from_file(db: Session, file_path: str) -> dict:
+PRODUCT_FILE_COLUMNS = {"barcode", "verticle", "trait", "rsp"}
+
+
+def _barcode_text(value) -> str:
     """
-    Insert products from Excel/CSV. Skips duplicates. Logs failures.
+    Barcode cell as text; Excel hands numeric barcodes over as floats (123.0).
     """
-    try:
-        if file_path.endswith((".xlsx", ".xls")):
-            df = pd.read_excel(file_path)
-        elif file_path.endswith(".csv"):
-            df = pd.read_csv(file_path)
-        else:
-            raise ValueError("Unsupported file format. Use .xlsx or .csv")
-
-        required_columns = {"barcode", "verticle", "trait", "rsp"}
-        if not required_columns.issubset(set(df.columns)):
-            raise ValueError(f"Missing columns: {required_columns - set(df.columns)}")
-
-        inserted = 0
-        skipped = []
-
-        for idx, row in df.iterrows():
-            barcode = str(row.get("barcode")).strip()
-            if not barcode or pd.isna(barcode):
-                skipped.append({"row": idx + 2, "reason": "Missing barcode"})
-                continue
-
-            verticle = str(row.get("verticle", "")).strip().lower()
-            trait = str(row.get("trait", "")).strip()
-            try:
-                rsp = float(row.get("rsp", 0.0))
-            except:
-                skipped.append({"row": idx + 2, "barcode": barcode, "reason": "Invalid RSP"})
-                continue
-
-            get_or_create_verticle(db, verticle)
-
-            # skip duplicate barcodes
-            if db.query(Product).filter_by(barcode=barcode).first():
-                skipped.append({"row": idx + 2, "barcode": barcode, "reason": "Duplicate barcode"})
-                continue
-
-            try:
-                db.add(Product(
-                    barcode=barcode,
-                    verticle=verticle,
-                    trait=trait,
-                    rsp=rsp
-                ))
-                inserted += 1
-            except Exception as e:
-                skipped.append({"row": idx + 2, "barcode": barcode, "reason": str(e)})
+    if pd.isna(value):
+        return ""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value).strip()
 
-        db.commit()
-        return {
-            "inserted": inserted,
-            "skipped": skipped
+
+def parse_product_rows(batch: pd.DataFrame) -> tuple[list[dict], list[dict]]:
+    """
+    Validate a batch of catalog rows. Returns (records, skipped) where skipped
+    entries carry the sheet row number and reason, as reported to the admin.
+    """
+    rows = batch.index + 2  # header is sheet row 1
+    barcodes = batch["barcode"].map(_barcode_text)
+    rsp = pd.to_numeric(batch["rsp"], errors="coerce")
+    verticles = batch["verticle"].fillna("").astype(str).str.strip().str.lower()
+    traits = batch["trait"].fillna("").astype(str).str.strip()
+
+    missing = barcodes == ""
+    invalid_rsp = ~missing & rsp.isna()
+
+    skipped = [{"row": int(r), "reason": "Missing barcode"} for r in rows[missing.to_numpy()]]
+    skipped += [
+        {"row": int(r), "barcode": b, "reason": "Invalid RSP"}
+        for r, b in zip(rows[invalid_rsp.to_numpy()], barcodes[invalid_rsp])
+    ]
+
+    valid = (~missing & ~invalid_rsp).to_numpy()
+    records = [
+        {"row": int(r), "barcode": b, "verticle": v, "trait": t, "rsp": float(p)}
+        for r, b, v, t, p in zip(rows[valid], barcodes[valid], verticles[valid], traits[valid], rsp[valid])
+    ]
+    return records, skipped
+
+
+def resolve_verticles(db: Session, names: set, known: set) -> None:
+    """
+    Make sure every verticle name exists: one lookup for names not already in
+    `known` and one bulk insert for the missing ones. `known` is updated in place.
+    """
+    pending = {n for n in names if n} - known
+    if not pending:
+        return
+    found = {
+        name.lower() for (name,) in
+        db.query(Verticle.name).filter(func.lower(Verticle.name).in_(pending)).all()
+    }
+    missing = pending - found
+    if missing:
+        db.execute(insert(Verticle), [{"name": n} for n in sorted(missing)])
+    known.update(pending)
+
+
+def _upsert_statement(db: Session, update_existing: bool):
+    """
+    Dialect-specific INSERT ... ON CONFLICT (barcode) for SQLite/Postgres, else None.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    stmt = dialect_insert(Product)
+    if not update_existing:
+        return stmt.on_conflict_do_nothing(index_elements=["barcode"])
+    return stmt.on_conflict_do_update(
+        index_elements=["barcode"],
+        set_={
+            "verticle": stmt.excluded.verticle,
+            "trait": stmt.excluded.trait,
+            "rsp": stmt.excluded.rsp,
         }
+    )
+
+
+def bulk_upsert_products(db: Session, records: list[dict], update_existing: bool) -> dict:
+    """
+    Write validated catalog rows with one keyed fetch of existing barcodes and
+    bulk statements. Existing barcodes are updated, or reported as duplicates
+    when update_existing is False. Repeats within the batch keep the last row
+    (update) or are reported (insert-only). The caller commits.
+    """
+    skipped = []
+    by_barcode = {}
+    for rec in records:
+        if rec["barcode"] in by_barcode and not update_existing:
+            skipped.append({"row": rec["row"], "barcode": rec["barcode"], "reason": "Duplicate barcode"})
+            continue
+        by_barcode[rec["barcode"]] = rec
+
+    existing = {
+        barcode for (barcode,) in
+        db.query(Product.barcode).filter(Product.barcode.in_(list(by_barcode))).all()
+    }
+
+    rows = []
+    for barcode, rec in by_barcode.items():
+        if barcode in existing and not update_existing:
+            skipped.append({"row": rec["row"], "barcode": barcode, "reason": "Duplicate barcode"})
+            continue
+        rows.append({k: rec[k] for k in ("barcode", "verticle", "trait", "rsp")})
+
+    if rows:
+        stmt = _upsert_statement(db, update_existing)
+        if stmt is not None:
+            db.execute(stmt, rows)
+        else:
+            new_rows = [r for r in rows if r["barcode"] not in existing]
+            if new_rows:
+                db.execute(insert(Product), new_rows)
+            if update_existing and len(new_rows) < len(rows):
+                db.execute(update(Product), [r for r in rows if r["barcode"] in existing])
+
+    updated = sum(1 for r in rows if r["barcode"] in existing)
+    return {
+        "inserted": len(rows) - updated,
+        "updated": updated,
+        "skipped": skipped
+    }
 
+
+def _import_catalog(db: Session, path: str, update_existing: bool, progress=None) -> dict:
+    """
+    Stream a catalog file batch by batch: validate rows, resolve verticles once
+    per distinct name and bulk write products. Commits once at the end.
+    """
+    inserted = 0
+    updated = 0
+    skipped = []
+    known_verticles = set()
+    written = []
+
+    try:
+        for batch in iter_sheet_batches(path, settings.UPLOAD_CHUNK_SIZE):
+            records, invalid = parse_product_rows(batch)
+            resolve_verticles(db, {r["verticle"] for r in records}, known_verticles)
+            result = bulk_upsert_products(db, records, update_existing)
+            written += [r["barcode"] for r in records]
+
+            inserted += result["inserted"]
+            updated += result["updated"]
+            skipped += invalid + result["skipped"]
+            if progress:
+                progress(inserted + updated + len(skipped))
+
+        db.commit()
+        invalidate_products()
+        barcode_index.add(written)
     except Exception as e:
         db.rollback()
         raise e
 
+    skipped.sort(key=lambda s: s["row"])
+    return {
+        "inserted": inserted,
+        "updated": updated,
+        "skipped": skipped
+    }
+
+
+def upsert_products_from_file(db: Session, file_path: str) -> dict:
+    """
+    Insert products from Excel/CSV. Skips duplicates. Logs failures.
+    """
+    if not file_path.endswith((".xlsx", ".csv")):
+        raise ValueError("Unsupported file format. Use .xlsx or .csv")
+
+    columns = set(sheet_columns(file_path))
+    if not PRODUCT_FILE_COLUMNS.issubset(columns):
+        raise ValueError(f"Missing columns: {PRODUCT_FILE_COLUMNS - columns}")
+
+    result = _import_catalog(db, file_path, update_existing=False)
+    return {
+        "inserted": result["inserted"],
+        "skipped": result["skipped"]
+    }
+
+
+def import_base_file(db: Session, path: str, progress=None) -> dict:
+    """
+    Stream a base product file (.xlsx/.csv) from disk and upsert each row by barcode.
+    """
+    require_columns(path, PRODUCT_FILE_COLUMNS, "barcode, verticle, trait, rsp")
+
+    result = _import_catalog(db, path, update_existing=True, progress=progress)
+    return {"message": "Base file uploaded and stored successfully.", **result}
@@ -0,0 +1,179 @@
+from collections import defaultdict
+from datetime import date, datetime, timezone
+from typing import Optional
+
+from sqlalchemy import func, insert, update, bindparam
+from sqlalchemy.orm import Session
+
+from models.daily_sales_rollup import DailySalesRollup
+from models.incentive import Incentive
+from models.sale import Sale
+from models.salesman import Salesman
+from services.leaderboard_cache import invalidate_leaderboards
+
+
+def utc_today() -> date:
+    return datetime.now(timezone.utc).date()
+
+
+def _upsert_statement(db: Session):
+    """
+    INSERT ... ON CONFLICT (salesman_id, day) that adds to the existing totals,
+    for SQLite/Postgres; None elsewhere.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        return None
+
+    stmt = dialect_insert(DailySalesRollup)
+    table = DailySalesRollup.__table__
+    return stmt.on_conflict_do_update(
+        index_elements=["salesman_id", "day"],
+        set_={
+            "amount": table.c.amount + stmt.excluded.amount,
+            "count": table.c.count + stmt.excluded.count,
+            "incentive": table.c.incentive + stmt.excluded.incentive,
+        }
+    )
+
+
+def add_to_rollup(db: Session, deltas: dict) -> None:
+    """
+    Add {(salesman_id, day): {"amount", "count", "incentive"}} onto the rollup.
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not deltas:
+        return
+
+    salesman_ids = {sid for sid, _ in deltas}
+    profiles = {
+        r.id: r for r in
+        db.query(Salesman.id, Salesman.outlet, Salesman.verticle)
+        .filter(Salesman.id.in_(salesman_ids))
+    }
+
+    rows = []
+    for (sid, day), delta in deltas.items():
+        profile = profiles.get(sid)
+        rows.append({
+            "salesman_id": sid,
+            "day": day,
+            "outlet": profile.outlet if profile else None,
+            "verticle": profile.verticle if profile else None,
+            "amount": delta.get("amount", 0.0),
+            "count": delta.get("count", 0),
+            "incentive": delta.get("incentive", 0.0),
+        })
+
+    stmt = _upsert_statement(db)
+    if stmt is not None:
+        db.execute(stmt, rows)
+        return
+
+    existing = {
+        (r.salesman_id, r.day) for r in
+        db.query(DailySalesRollup.salesman_id, DailySalesRollup.day)
+        .filter(DailySalesRollup.salesman_id.in_(salesman_ids))
+        .filter(DailySalesRollup.day.in_({day for _, day in deltas}))
+    }
+    new_rows = [r for r in rows if (r["salesman_id"], r["day"]) not in existing]
+    if new_rows:
+        db.execute(insert(DailySalesRollup), new_rows)
+    old_rows = [
+        {**r, "sid": r["salesman_id"], "d": r["day"]}
+        for r in rows if (r["salesman_id"], r["day"]) in existing
+    ]
+    if old_rows:
+        table = DailySalesRollup.__table__
+        db.execute(
+            update(table)
+            .where(table.c.salesman_id == bindparam("sid"), table.c.day == bindparam("d"))
+            .values(
+                amount=table.c.amount + bindparam("amount"),
+                count=table.c.count + bindparam("count"),
+                incentive=table.c.incentive + bindparam("incentive"),
+            ),
+            old_rows
+        )
+
+
+def rollup_incentives(db: Session, incentives: list[dict], day: Optional[date] = None) -> None:
+    """
+    Add freshly inserted incentive rows (salesman_id, amount) to `day` (default today).
+    """
+    day = day or utc_today()
+    deltas = defaultdict(lambda: {"incentive": 0.0})
+    for row in incentives:
+        deltas[(row["salesman_id"], day)]["incentive"] += row["amount"] or 0.0
+    add_to_rollup(db, deltas)
+
+
+def rebuild_rollup(db: Session) -> int:
+    """
+    Recompute the whole rollup from sales and incentives. Returns rows written.
+    """
+    deltas = defaultdict(lambda: {"amount": 0.0, "count": 0, "incentive": 0.0})
+
+    sale_day = func.date(Sale.timestamp)
+    for r in (
+        db.query(Sale.salesman_id, sale_day.label("day"),
+                 func.sum(Sale.amount).label("amount"), func.count(Sale.id).label("count"))
+        .filter(Sale.salesman_id.isnot(None), Sale.timestamp.isnot(None))
+        .group_by(Sale.salesman_id, sale_day)
+    ):
+        deltas[(r.salesman_id, _as_date(r.day))].update(amount=r.amount or 0.0, count=r.count)
+
+    incentive_day = func.date(Incentive.timestamp)
+    for r in (
+        db.query(Incentive.salesman_id, incentive_day.label("day"),
+                 func.sum(Incentive.amount).label("incentive"))
+        .filter(Incentive.salesman_id.isnot(None), Incentive.timestamp.isnot(None))
+        .group_by(Incentive.salesman_id, incentive_day)
+    ):
+        deltas[(r.salesman_id, _as_date(r.day))]["incentive"] = r.incentive or 0.0
+
+    try:
+        db.query(DailySalesRollup).delete(synchronize_session=False)
+        add_to_rollup(db, deltas)
+        db.commit()
+    except Exception as e:
+        db.rollback()
+        raise e
+    invalidate_leaderboards()
+    return len(deltas)
+
+
+def _as_date(value) -> date:
+    # func.date() comes back as a string on SQLite
+    return value if isinstance(value, date) else date.fromisoformat(value)
+
+
+def in_days(start: Optional[date] = None, end: Optional[date] = None) -> list:
+    """
+    Filters on DailySalesRollup.day for an inclusive [start, end] range.
+    """
+    return [c for c in (
+        DailySalesRollup.day >= start if start else None,
+        DailySalesRollup.day <= end if end else None,
+    ) if c is not None]
+
+
+def top_sales(db: Session, start: Optional[date] = None, end: Optional[date] = None, limit: Optional[int] = None):
+    """
+    Salesmen ranked by total sales in [start, end], as (id, name, total) rows.
+    """
+    total = func.sum(DailySalesRollup.amount)
+    query = (
+        db.query(Salesman.id, Salesman.name, total.label("total"))
+        .join(DailySalesRollup, DailySalesRollup.salesman_id == Salesman.id)
+        .filter(*in_days(start, end))
+        .group_by(Salesman.id, Salesman.name)
+        .order_by(total.desc())
+    )
+    if limit:
+        query = query.limit(limit)
+    return query.all()
@@ -1,68 +1,104 @@
+from sqlalchemy import insert, func
+from typing import Optional
+from datetime import datetime, timezone
 from sqlalchemy.orm import Session
 from models.sale import Sale
-from schemas.sale_schema import SaleSubmit
-from models.product import Product
-from models.trait_config import TraitConfig
-
-from sqlalchemy.orm import Session
-from models.sale import Sale
-from models.product import Product
-from models.trait_config import TraitConfig
 from models.incentive import Incentive
 from models.salesman import Salesman
 from schemas.sale_schema import SaleSubmit
+from services.catalog_cache import get_products, get_trait_map
+from crud.rollup_crud import add_to_rollup, utc_today
+from crud.wallet_crud import post_entries, INCENTIVE
+from services.leaderboard_cache import invalidate_leaderboards
+from services.leaderboard_events import notify_standings_changed
+from services.rank_index import rank_index, record_incentives
+from services.principal_cache import invalidate_salesmen
+from utils.pagination import after_cursor
 
 
 def submit_sale(db: Session, sale: SaleSubmit, salesman_id: int):
-    sales_to_commit = []
-    incentives_to_commit = []
+    """
+    Record a basket as one batch: reference data from the catalog cache,
+    bulk inserts for the Sale and Incentive rows and a single wallet credit.
+    Items with an unknown barcode or trait are skipped.
+    """
+    sale_rows = []
+    incentive_rows = []
+    wallet_delta = 0.0
+
+    # Reference data comes from the catalog cache
+    products = get_products(db, [item.barcode for item in sale.items])
+    traits = get_trait_map(db)
 
     for item in sale.items:
-        product = db.query(Product).filter_by(barcode=item.barcode).first()
+        product = products.get(item.barcode)
         if not product:
             continue
 
-        trait = db.query(TraitConfig).filter_by(trait=product.trait).first()
+        trait = traits.get(product["trait"])
         if not trait:
             continue
 
         # 💰 Sale amount: barcode × qty × rsp
-        sale_amount = product.rsp * item.qty
+        sale_amount = product["rsp"] * item.qty
 
         # 🎯 Incentive amount: sale_amount × trait%
-        incentive_amount = sale_amount * (trait.percentage / 100)
-
-        # 👉 Record the sale
-        new_sale = Sale(
-            barcode=item.barcode,
-            qty=item.qty,
-            amount=sale_amount,
-            customer_name=sale.customer_name,
-            customer_number=sale.customer_number,
-            salesman_id=salesman_id
-        )
-        db.add(new_sale)
-        sales_to_commit.append(new_sale)
-
-        # 👉 Record incentive
-        incentive = Incentive(
-            salesman_id=salesman_id,
-            barcode=item.barcode,
-            amount=incentive_amount,
-            trait=product.trait,
-            is_visible=trait.is_visible
-        )
-        db.add(incentive)
-        incentives_to_commit.append(incentive)
+        incentive_amount = sale_amount * (trait["percentage"] / 100)
 
-        # 💸 Add to wallet balance
-        salesman = db.query(Salesman).filter_by(id=salesman_id).first()
-        if salesman:
-            salesman.wallet_balance += incentive_amount
+        sale_rows.append({
+            "barcode": item.barcode,
+            "qty": item.qty,
+            "amount": sale_amount,
+            "customer_name": sale.customer_name,
+            "customer_number": sale.customer_number,
+            "salesman_id": salesman_id
+        })
+        incentive_rows.append({
+            "salesman_id": salesman_id,
+            "barcode": item.barcode,
+            "amount": incentive_amount,
+            "trait": product["trait"],
+            "is_visible": trait["is_visible"]
+        })
+        wallet_delta += incentive_amount
+
+    if not sale_rows:
+        return []
 
     try:
-        db.commit()
-        return sales_to_commit
+        # Plain rows, not ORM objects: commit would expire those and the
+        # response would reload each one with its own SELECT
+        new_sales = db.execute(
+            insert(Sale).returning(
+                Sale.id, Sale.barcode, Sale.qty, Sale.amount,
+                Sale.customer_name, Sale.customer_number, Sale.timestamp
+            ),
+            sale_rows
+        ).all()
+        db.execute(insert(Incentive), incentive_rows)
+
+        # 💸 One ledger entry and atomic wallet credit for the whole basket
+        post_entries(db, [{"salesman_id": salesman_id, "type": INCENTIVE, "amount": wallet_delta, "source": "sale"}])
+
+        # 📊 Keep the daily rollup in step, in the same transaction
+        deltas = {}
+        for new_sale in new_sales:
+            key = (salesman_id, (new_sale.timestamp or datetime.now(timezone.utc)).date())
+            delta = deltas.setdefault(key, {"amount": 0.0, "count": 0, "incentive": 0.0})
+            delta["amount"] += new_sale.amount
+            delta["count"] += 1
+        delta = deltas.setdefault((salesman_id, utc_today()), {"amount": 0.0, "count": 0, "incentive": 0.0})
+        delta["incentive"] += wallet_delta
+        add_to_rollup(db, deltas)
+
+        with rank_index.committing() as seq:
+            db.commit()
+        for board in ("day", "week", "month"):
+            invalidate_leaderboards(board)
+        notify_standings_changed()
+        record_incentives(incentive_rows, seq)
+        invalidate_salesmen([salesman_id])
+        return new_sales
     except Exception as e:
         db.rollback()
         raise e
@@ -73,3 +109,49 @@ def get_sales_by_salesman(db: Session, salesman_id: int) -> list[Sale]:
     Return all sales entered by a specific salesman.
     """
     return db.query(Sale).filter_by(salesman_id=salesman_id).all()
+
+
+def admin_sales_query(
+    db: Session,
+    from_date: Optional[str] = None,
+    to_date: Optional[str] = None,
+    outlet: Optional[str] = None,
+    search: Optional[str] = None,
+    cursor: Optional[str] = None
+):
+    """
+    Sales joined to their salesman's name and outlet, newest first, with every
+    filter applied in SQL. `cursor` continues after a previous page.
+    """
+    query = (
+        db.query(
+            Sale.id,
+            Sale.timestamp,
+            Sale.customer_name,
+            Sale.customer_number,
+            Sale.barcode,
+            Sale.qty,
+            Sale.amount,
+            func.coalesce(Salesman.name, "Unknown").label("salesman_name"),
+            func.coalesce(Salesman.outlet, "Unknown").label("outlet")
+        )
+        .outerjoin(Salesman, Salesman.id == Sale.salesman_id)
+    )
+
+    if from_date:
+        query = query.filter(Sale.timestamp >= from_date)
+    if to_date:
+        query = query.filter(Sale.timestamp <= to_date)
+    if outlet:
+        query = query.filter(Salesman.outlet == outlet)
+    if search:
+        search_term = f"%{search}%"
+        query = query.filter(
+            (Sale.customer_name.ilike(search_term)) |
+            (Sale.customer_number.ilike(search_term)) |
+            (Sale.barcode.ilike(search_term))
+        )
+    if cursor:
+        query = query.filter(after_cursor(Sale.timestamp, Sale.id, cursor))
+
+    return query.order_by(Sale.timestamp.desc(), Sale.id.desc())
@@ -1,12 +1,19 @@
 from sqlalchemy.orm import Session
 from models.salesman import Salesman
-from schemas.salesman_schema import SalesmanCreate, SalesmanApprove
+from models.daily_sales_rollup import DailySalesRollup
+from models.claim import Claim
+from schemas.salesman_schema import SalesmanCreate, SalesmanApprove, SalesmanSummaryOut
+from sqlalchemy import func, select
+from datetime import datetime
 from utils.hash import hash_password, verify_password
 from typing import Optional
+from crud.rollup_crud import in_days
+from services.leaderboard_cache import invalidate_leaderboards
+from services.principal_cache import invalidate_principal
 
 
 
-def create_salesman(db: Session, data: SalesmanCreate) -> Salesman:
+def create_salesman(db: Session, data: SalesmanCreate, password_hash: str = None) -> Salesman:
     existing = db.query(Salesman).filter_by(mobile=data.mobile).first()
     if existing:
         raise ValueError("Salesman with this mobile already exists")
@@ -16,7 +23,7 @@ def create_salesman(db: Session, data: SalesmanCreate) -> Salesman:
         mobile      = data.mobile,
         outlet      = data.outlet,
         verticle    = data.verticle,        # rename field later
-        password    = hash_password(data.password),
+        password    = password_hash or hash_password(data.password),
         is_approved = False                  # or False if admin approval needed
     )
 
@@ -43,6 +50,9 @@ def approve_salesman(db: Session, salesman_id: int, approve: bool) -> Optional[S
     if not salesman:
         return None
 
+    if salesman.is_approved and not approve:
+        # Revoke tokens issued while approved
+        salesman.token_version = (salesman.token_version or 0) + 1
     salesman.is_approved = approve
 
     try:
@@ -51,6 +61,7 @@ def approve_salesman(db: Session, salesman_id: int, approve: bool) -> Optional[S
     except Exception as e:
         db.rollback()
         raise e
+    invalidate_principal("salesman", salesman.mobile)
 
     return salesman
 
@@ -85,4 +96,89 @@ def delete_salesman(db: Session, salesman_id: int) -> bool:
         return False
     db.delete(salesman)
     db.commit()
-    return True
\ No newline at end of file
+    invalidate_principal("salesman", salesman.mobile)
+    invalidate_leaderboards()
+    return True
+
+
+def salesman_summary_query(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    outlet: Optional[str] = None,
+    verticle: Optional[str] = None
+):
+    """
+    Sales, incentive and claimed totals for approved salesmen in one query:
+    sales and incentives come from the daily rollup for the days in
+    [start_date, end_date], claimed is all-time from claims.
+    """
+    totals = (
+        select(
+            DailySalesRollup.salesman_id,
+            func.sum(DailySalesRollup.amount).label("sales"),
+            func.sum(DailySalesRollup.incentive).label("incentive")
+        )
+        .where(*in_days(
+            start_date.date() if start_date else None,
+            end_date.date() if end_date else None
+        ))
+        .group_by(DailySalesRollup.salesman_id)
+        .subquery()
+    )
+    claims = (
+        select(Claim.salesman_id, func.sum(Claim.amount).label("total"))
+        .where(Claim.status.in_(["approved", "paid"]))
+        .group_by(Claim.salesman_id)
+        .subquery()
+    )
+
+    query = (
+        db.query(
+            Salesman.id,
+            Salesman.name,
+            Salesman.mobile,
+            Salesman.outlet,
+            Salesman.wallet_balance,
+            func.coalesce(totals.c.sales, 0).label("total_sales"),
+            func.coalesce(totals.c.incentive, 0).label("total_incentive"),
+            func.coalesce(claims.c.total, 0).label("total_claimed")
+        )
+        .outerjoin(totals, totals.c.salesman_id == Salesman.id)
+        .outerjoin(claims, claims.c.salesman_id == Salesman.id)
+        .filter(Salesman.is_approved == True)
+    )
+    if outlet:
+        query = query.filter(Salesman.outlet == outlet)
+    if verticle:
+        query = query.filter(Salesman.verticle == verticle)
+
+    return query.order_by(Salesman.id)
+
+
+def summarize_salesmen(
+    db: Session,
+    start_date: Optional[datetime] = None,
+    end_date: Optional[datetime] = None,
+    outlet: Optional[str] = None,
+    verticle: Optional[str] = None,
+    limit: Optional[int] = None,
+    offset: int = 0
+) -> list[SalesmanSummaryOut]:
+    query = salesman_summary_query(db, start_date, end_date, outlet, verticle).offset(offset)
+    if limit:
+        query = query.limit(limit)
+
+    return [
+        SalesmanSummaryOut(
+            id=r.id,
+            name=r.name,
+            mobile=r.mobile,
+            outlet=r.outlet,
+            total_sales=r.total_sales,
+            total_incentive=r.total_incentive,
+            total_claimed=r.total_claimed,
+            wallet_balance=r.wallet_balance or 0.0
+        )
+        for r in query.all()
+    ]
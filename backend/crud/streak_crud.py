@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from models.streak import Streak
 from datetime import date
+from services.leaderboard_cache import invalidate_leaderboards
 
 def get_streaks_for_salesman(db: Session, salesman_id: int):
     return db.query(Streak).filter(Streak.salesman_id == salesman_id).order_by(Streak.date.desc()).all()
@@ -15,4 +16,5 @@ def add_or_update_streak(db: Session, salesman_id: int, streak_date: date, conti
     db.add(streak)
     db.commit()
     db.refresh(streak)
+    invalidate_leaderboards("streak")
     return streak
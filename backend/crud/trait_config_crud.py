@@ -1,5 +1,6 @@
 from sqlalchemy.orm import Session
 from models.trait_config import TraitConfig
+from services.catalog_cache import invalidate_traits
 
 
 def get_all_traits(db: Session) -> list[TraitConfig]:
@@ -42,6 +43,7 @@ def update_trait(
         db.rollback()
         raise e
 
+    invalidate_traits()
     return record
 
 
@@ -73,6 +75,8 @@ def create_trait(
         db.rollback()
         raise e
 
+    invalidate_traits()
+
     return new_trait
 
 
@@ -92,4 +96,6 @@ def delete_trait(db: Session, trait: str) -> bool:
         db.rollback()
         raise e
 
+    invalidate_traits()
+
     return True
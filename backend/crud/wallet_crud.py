@@ -0,0 +1,117 @@
+from collections import defaultdict
+from sqlalchemy import update, insert, select, func, bindparam
+from sqlalchemy.orm import Session
+from models.salesman import Salesman
+from models.wallet_ledger import WalletEntry
+
+# Ledger entry types
+OPENING = "opening"
+INCENTIVE = "incentive"
+REWARD = "reward"
+CLAIM_HOLD = "claim_hold"
+REFUND = "refund"
+
+# Differences below this are float noise, not drift
+TOLERANCE = 0.005
+
+
+def post_entries(db: Session, entries: list[dict]) -> None:
+    """
+    Append ledger entries ({salesman_id, type, amount, claim_id?, source?})
+    and add each salesman's summed amount to wallet_balance with one
+    executemany UPDATE ... SET wallet_balance = wallet_balance + :delta.
+    Runs in the caller's transaction; the caller commits.
+    """
+    entries = [e for e in entries if e["amount"]]
+    if not entries:
+        return
+    db.execute(insert(WalletEntry), [
+        {"claim_id": None, "source": None, **entry} for entry in entries
+    ])
+
+    deltas = defaultdict(float)
+    for entry in entries:
+        deltas[entry["salesman_id"]] += entry["amount"]
+    salesmen = Salesman.__table__
+    db.execute(
+        update(salesmen)
+        .where(salesmen.c.id == bindparam("salesman_id"))
+        .values(wallet_balance=func.coalesce(salesmen.c.wallet_balance, 0.0) + bindparam("delta")),
+        [{"salesman_id": sid, "delta": delta} for sid, delta in deltas.items()]
+    )
+
+
+def hold_for_claim(db: Session, salesman_id: int, amount: float, claim_id: int) -> bool:
+    """
+    Debit a claim from the wallet if the balance covers it. The check and
+    the debit are one conditional UPDATE, so two concurrent claims can't
+    both spend the same balance. Returns False (nothing written) otherwise.
+    """
+    held = db.execute(
+        update(Salesman)
+        .where(Salesman.id == salesman_id, Salesman.wallet_balance >= amount)
+        .values(wallet_balance=Salesman.wallet_balance - amount)
+        .execution_options(synchronize_session=False)
+    ).rowcount
+    if held != 1:
+        return False
+    db.execute(insert(WalletEntry), [{
+        "salesman_id": salesman_id, "type": CLAIM_HOLD, "amount": -amount, "claim_id": claim_id
+    }])
+    return True
+
+
+def get_ledger(db: Session, salesman_id: int, limit: int = 100) -> list[WalletEntry]:
+    return (
+        db.query(WalletEntry)
+        .filter(WalletEntry.salesman_id == salesman_id)
+        .order_by(WalletEntry.id.desc())
+        .limit(limit)
+        .all()
+    )
+
+
+def reconcile_wallets(db: Session, batch_size: int = 5000, fix: bool = False) -> dict:
+    """
+    Compare every wallet_balance with the sum of its ledger entries, a batch
+    of salesman ids at a time. fix=True resets mismatched balances to the
+    ledger sum (the ledger is the source of truth).
+    """
+    checked = 0
+    mismatches = []
+    last_id = 0
+    while True:
+        ids = db.scalars(
+            select(Salesman.id).where(Salesman.id > last_id).order_by(Salesman.id).limit(batch_size)
+        ).all()
+        if not ids:
+            break
+        last_id = ids[-1]
+
+        ledger = (
+            select(WalletEntry.salesman_id, func.sum(WalletEntry.amount).label("total"))
+            .where(WalletEntry.salesman_id.between(ids[0], last_id))
+            .group_by(WalletEntry.salesman_id)
+            .subquery()
+        )
+        rows = db.execute(
+            select(Salesman.id, Salesman.wallet_balance, func.coalesce(ledger.c.total, 0.0))
+            .outerjoin(ledger, ledger.c.salesman_id == Salesman.id)
+            .where(Salesman.id.between(ids[0], last_id))
+        ).all()
+
+        checked += len(rows)
+        for salesman_id, balance, total in rows:
+            if abs((balance or 0.0) - total) > TOLERANCE:
+                mismatches.append({"salesman_id": salesman_id, "balance": balance or 0.0, "ledger": total})
+
+    if fix and mismatches:
+        db.execute(
+            update(Salesman.__table__)
+            .where(Salesman.__table__.c.id == bindparam("salesman_id"))
+            .values(wallet_balance=bindparam("ledger")),
+            [{"salesman_id": m["salesman_id"], "ledger": m["ledger"]} for m in mismatches]
+        )
+        db.commit()
+
+    return {"checked": checked, "mismatched": len(mismatches), "fixed": fix, "mismatches": mismatches}
@@ -0,0 +1,51 @@
+# backend/db/async_database.py
+import os
+
+from sqlalchemy.engine import make_url
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
+
+from db.database import DATABASE_URL, pool_options
+from db.query_stats import track_queries
+
+
+def _async_url(url: str) -> str:
+    """
+    Async driver URL for DATABASE_URL: asyncpg for Postgres, aiosqlite locally.
+    """
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend == "sqlite":
+        url = url.set(drivername="sqlite+aiosqlite")
+    elif backend in ("postgres", "postgresql"):
+        # asyncpg takes ssl via connect_args, not a libpq sslmode parameter
+        url = url.set(drivername="postgresql+asyncpg").difference_update_query(["sslmode"])
+    return url.render_as_string(hide_password=False)
+
+
+ASYNC_DATABASE_URL = os.getenv("ASYNC_DATABASE_URL") or _async_url(DATABASE_URL)
+
+try:
+    if ASYNC_DATABASE_URL.startswith("sqlite"):
+        async_engine = create_async_engine(ASYNC_DATABASE_URL)
+    else:
+        async_engine = create_async_engine(
+            ASYNC_DATABASE_URL, connect_args={"ssl": "require"}, **pool_options()
+        )
+except ImportError:
+    # Driver (asyncpg / aiosqlite) not installed: scripts and sync routes
+    # still work, async routes fail with a clear error
+    async_engine = None
+
+if async_engine is not None:
+    track_queries(async_engine.sync_engine)
+
+AsyncSessionLocal = async_sessionmaker(
+    async_engine, class_=AsyncSession, autoflush=False, expire_on_commit=False
+)
+
+
+async def get_async_db():
+    if async_engine is None:
+        raise RuntimeError(f"No async driver installed for {ASYNC_DATABASE_URL}")
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -3,20 +3,40 @@ from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker, Session
 import os
 
+from db.query_stats import track_queries
+
 DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./incentive.db")
 
+
+def pool_options() -> dict:
+    """
+    Connection pool settings for server databases, shared by the sync and
+    async engines. SQLite keeps SQLAlchemy's defaults.
+    """
+    return {
+        "pool_size": int(os.getenv("DB_POOL_SIZE", "10")),
+        "max_overflow": int(os.getenv("DB_MAX_OVERFLOW", "20")),
+        "pool_pre_ping": os.getenv("DB_POOL_PRE_PING", "true").lower() == "true",
+        "pool_recycle": int(os.getenv("DB_POOL_RECYCLE", "1800")),  # seconds
+    }
+
+
 if DATABASE_URL.startswith("sqlite"):
     engine = create_engine(
         DATABASE_URL, connect_args={"check_same_thread": False}
     )
 else:
     engine = create_engine(
-        DATABASE_URL, connect_args={"sslmode": "require"}
+        DATABASE_URL, connect_args={"sslmode": "require"}, **pool_options()
     )
 
+track_queries(engine)
+
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
+# One session per request: FastAPI caches dependencies within a request, so
+# the auth dependencies and the route share this session and its connection
 def get_db():
     db: Session = SessionLocal()
     try:
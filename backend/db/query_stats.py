@@ -0,0 +1,94 @@
+# backend/db/query_stats.py
+import logging
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+
+from sqlalchemy import event
+from starlette.datastructures import MutableHeaders
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class QueryStats:
+    queries: int = 0
+    db_time: float = 0.0    # seconds spent in cursor.execute
+    checkouts: int = 0      # pooled connections taken
+
+
+_current: ContextVar[QueryStats | None] = ContextVar("query_stats", default=None)
+
+
+def current_query_stats() -> QueryStats | None:
+    """
+    Stats for the request being served, or None outside a request.
+    """
+    return _current.get()
+
+
+def track_queries(engine) -> None:
+    """
+    Count statements, DB time and connection checkouts on `engine` against
+    the current request. Pass the sync engine (AsyncEngine.sync_engine).
+    """
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_started", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - conn.info["query_started"].pop()
+        stats = _current.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_time += elapsed
+
+    @event.listens_for(engine, "handle_error")
+    def _failed(context):
+        started = context.connection.info.get("query_started") if context.connection else None
+        if started:
+            started.pop()
+
+    @event.listens_for(engine, "checkout")
+    def _checkout(dbapi_connection, connection_record, connection_proxy):
+        stats = _current.get()
+        if stats is not None:
+            stats.checkouts += 1
+
+
+class QueryStatsMiddleware:
+    """
+    Collects QueryStats per HTTP request and reports them in the response
+    headers (X-DB-Queries, X-DB-Connections and a Server-Timing "db" entry).
+    Headers go out with the first response message, so a streamed body's
+    later queries only show up in the debug log.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = QueryStats()
+        token = _current.set(stats)
+
+        async def send_with_stats(message):
+            if message["type"] == "http.response.start":
+                headers = MutableHeaders(scope=message)
+                headers.append("X-DB-Queries", str(stats.queries))
+                headers.append("X-DB-Connections", str(stats.checkouts))
+                headers.append("Server-Timing", f"db;dur={stats.db_time * 1000:.1f}")
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _current.reset(token)
+            logger.debug(
+                "%s %s: %d queries, %.1f ms db, %d connections",
+                scope["method"], scope["path"], stats.queries, stats.db_time * 1000, stats.checkouts
+            )
@@ -20,18 +20,59 @@ from api import (
 from api.claim_router import router as claim_router
 from api.wallet_router import router as wallet_router
 from api.leaderboard_router import router as leaderboard_router
+from api.job_router import router as job_router
+from db.database import SessionLocal
+from db.query_stats import QueryStatsMiddleware
+from services import job_queue
+from services.rank_index import rank_index
+from services.password_hasher import password_hasher
+from crud.idempotency_crud import purge_expired_idempotency_keys
 import logging
 
 logging.basicConfig(level=logging.DEBUG)
 
 app = FastAPI(title="Incentive Management System")
 
+@app.on_event("startup")
+def fail_stale_jobs():
+    # Jobs run in-process; those whose worker stopped sending heartbeats were lost with it
+    db = SessionLocal()
+    try:
+        job_queue.fail_interrupted_jobs(db)
+    finally:
+        db.close()
+    job_queue.purge_expired_results()
+
+@app.on_event("startup")
+def purge_idempotency_keys():
+    db = SessionLocal()
+    try:
+        purge_expired_idempotency_keys(db)
+    finally:
+        db.close()
+
+@app.on_event("startup")
+def load_rank_index():
+    db = SessionLocal()
+    try:
+        rank_index.rebuild(db)
+    finally:
+        db.close()
+
+@app.on_event("shutdown")
+def stop_workers():
+    job_queue.shutdown()
+    password_hasher.shutdown()
+
+app.add_middleware(QueryStatsMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=["http://localhost:5173", "https://incentive-app-vert.vercel.app","https://incentive-app-gf1z.onrender.com","https://www.sales.advancedtradingmart.com"],
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],  # keyset paging of /api/sales/admin/sales and the claims lists
 )
 
 # Mount API routers (register each router only ONCE, and with consistent tags)
@@ -52,3 +93,4 @@ app.include_router(claim_router,            prefix="/api",            tags=["Cla
 app.include_router(salesman_router.router,  prefix="/api/salesman",   tags=["Salesman"])
 app.include_router(verticle_router.router,  prefix="/api/admin",      tags=["Verticles"])
 app.include_router(wallet_router,           prefix="/api",            tags=["Wallet"])
+app.include_router(job_router,              prefix="/api/jobs",       tags=["Jobs"])
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey
+from sqlalchemy import Column, String, Integer, Float, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db.database import Base
@@ -6,6 +6,11 @@ from db.database import Base
 
 class ActualSale(Base):
     __tablename__ = "actual_sales"
+    __table_args__ = (
+        # Sale match key (see incentive_crud._actual_sale_match); barcode first
+        # also serves the upload duplicate lookup by barcode
+        Index("ix_actual_sales_match", "barcode", "customer", "qty", "net_amount"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     date = Column(DateTime, nullable=False)
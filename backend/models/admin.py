@@ -11,3 +11,4 @@ class Admin(Base):
     mobile = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
     is_active = Column(Boolean, default=True)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped to revoke tokens
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, Float, Boolean, String, DateTime, ForeignKey
+from sqlalchemy import Column, Integer, Float, Boolean, String, DateTime, ForeignKey, Index
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from db.database import Base
@@ -6,6 +6,12 @@ from typing import Optional
 
 class Claim(Base):
     __tablename__ = "claims"
+    __table_args__ = (
+        Index("ix_claims_salesman_status_timestamp", "salesman_id", "status", "timestamp"),  # my claims / pending claim
+        Index("ix_claims_status_timestamp", "status", "timestamp"),                          # admin pending list, totals
+        Index("ix_claims_salesman_timestamp", "salesman_id", "timestamp"),                   # my claims, newest first
+        Index("ix_claims_timestamp", "timestamp"),                                            # admin claims pages
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     salesman_id = Column(Integer, ForeignKey("salesmen.id"))
@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String, Float, Date, ForeignKey
+from db.database import Base
+
+class DailySalesRollup(Base):
+    __tablename__ = "daily_sales_rollup"
+
+    # One row per salesman per (UTC) day, kept in step with sales and incentives
+    salesman_id = Column(Integer, ForeignKey("salesmen.id", ondelete="CASCADE"), primary_key=True)
+    day = Column(Date, primary_key=True, index=True)
+    outlet = Column(String)
+    verticle = Column(String)
+    amount = Column(Float, nullable=False, default=0.0)     # sum of sales.amount
+    count = Column(Integer, nullable=False, default=0)      # number of sales rows
+    incentive = Column(Float, nullable=False, default=0.0)  # sum of incentives.amount
@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from db.database import Base
+
+class IdempotencyKey(Base):
+    __tablename__ = "idempotency_keys"
+
+    # A client-chosen Idempotency-Key, per user and operation; the primary
+    # key makes a concurrent retry of the same request collide on insert
+    scope = Column(String, primary_key=True)                # e.g. "claim"
+    owner = Column(String, primary_key=True)                # e.g. "salesman:42"
+    key = Column(String, primary_key=True)
+    request_hash = Column(String, nullable=False)           # sha256 of the request body
+    resource_id = Column(Integer, nullable=True)            # what the first request created
+    created_at = Column(DateTime, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False, index=True)
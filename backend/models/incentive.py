@@ -1,9 +1,15 @@
-from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey, DateTime
+from sqlalchemy import Column, Integer, Float, String, Boolean, ForeignKey, DateTime, Index
 from datetime import datetime
 from db.database import Base
 
 class Incentive(Base):
     __tablename__ = "incentives"
+    __table_args__ = (
+        Index("ix_incentives_salesman_visible_timestamp", "salesman_id", "is_visible", "timestamp"),  # wallet, summary, rank
+        Index("ix_incentives_salesman_barcode_trait", "salesman_id", "barcode", "trait"),  # already-rewarded check
+        Index("ix_incentives_salesman_claimed", "salesman_id", "claimed"),                 # amend reclaim
+        Index("ix_incentives_timestamp", "timestamp"),                                     # admin listing by period
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     salesman_id = Column(Integer, ForeignKey("salesmen.id"))
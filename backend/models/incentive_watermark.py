@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, DateTime
+from datetime import datetime
+from db.database import Base
+
+class IncentiveWatermark(Base):
+    __tablename__ = "incentive_watermarks"
+
+    id = Column(Integer, primary_key=True, index=True)
+    last_sale_id = Column(Integer, default=0)         # highest sales.id already matched
+    last_actual_sale_id = Column(Integer, default=0)  # highest actual_sales.id already seen
+    updated_at = Column(DateTime, default=datetime.utcnow)
@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, DateTime, JSON
+from datetime import datetime
+from db.database import Base
+
+class Job(Base):
+    __tablename__ = "jobs"
+
+    id = Column(String, primary_key=True, index=True)      # uuid4 hex
+    kind = Column(String, index=True)                      # e.g. "generate_incentives", "sales_file"
+    status = Column(String, default="queued", index=True)  # queued, running, succeeded, failed
+    processed = Column(Integer, default=0)                 # rows/items handled so far
+    total = Column(Integer, nullable=True)                 # None when the size is unknown
+    result = Column(JSON, nullable=True)
+    error = Column(String, nullable=True)
+    created_by = Column(String, nullable=True)             # admin mobile
+    created_at = Column(DateTime, default=datetime.utcnow)
+    started_at = Column(DateTime, nullable=True)
+    finished_at = Column(DateTime, nullable=True)
+    heartbeat_at = Column(DateTime, nullable=True)          # last sign of life from the owning worker
@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey
+from datetime import datetime
+from db.database import Base
+
+# Why a sale is still waiting for its incentive
+NO_ACTUAL_SALE = "no_actual_sale"  # no actual sale confirms it yet
+NOT_PAYABLE = "not_payable"        # confirmed, but no product / paying trait for its barcode
+
+class PendingMatch(Base):
+    __tablename__ = "pending_matches"
+
+    # Sale that could not be paid when incentives were last generated
+    sale_id = Column(Integer, ForeignKey("sales.id", ondelete="CASCADE"), primary_key=True)
+    reason = Column(String, nullable=False, default=NO_ACTUAL_SALE, server_default=NO_ACTUAL_SALE)
+    created_at = Column(DateTime, default=datetime.utcnow)
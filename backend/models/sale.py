@@ -1,9 +1,13 @@
-from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float
+from sqlalchemy import Column, Integer, String, ForeignKey, DateTime, Float, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
 from datetime import datetime, timezone
 class Sale(Base):
     __tablename__ = "sales"
+    __table_args__ = (
+        Index("ix_sales_salesman_id_timestamp", "salesman_id", "timestamp"),  # my sales, per-salesman ranges
+        Index("ix_sales_timestamp_id", "timestamp", "id"),                    # admin listing, newest first
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     barcode = Column(String, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Boolean, DateTime
+from sqlalchemy import Column, Integer, String, Boolean, DateTime, Float
 from sqlalchemy.orm import relationship
 from db.database import Base
 from datetime import datetime
@@ -12,10 +12,11 @@ class Salesman(Base):
     verticle = Column(String, nullable=True)  # set after approval
     password = Column(String, nullable=True)  # set after approval
     is_approved = Column(Boolean, default=False)
-    wallet_balance = Column(Integer, default=0)
+    wallet_balance = Column(Float, default=0.0)  # running total of wallet_ledger, see crud/wallet_crud.py
     claims = relationship("Claim", back_populates="salesman")
     sales = relationship("Sale", back_populates="salesman")
     created_at = Column(DateTime, default=datetime.utcnow)
+    token_version = Column(Integer, nullable=False, default=0, server_default="0")  # bumped to revoke tokens
     streaks = relationship("Streak", back_populates="salesman", cascade="all, delete")
     claims = relationship("Claim", back_populates="salesman")
 
@@ -1,9 +1,12 @@
-from sqlalchemy import Column, Integer, Date, ForeignKey, Boolean
+from sqlalchemy import Column, Integer, Date, ForeignKey, Boolean, Index
 from sqlalchemy.orm import relationship
 from db.database import Base
 
 class Streak(Base):
     __tablename__ = "streaks"
+    __table_args__ = (
+        Index("ix_streaks_salesman_id_date", "salesman_id", "date"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     salesman_id = Column(Integer, ForeignKey("salesmen.id"))
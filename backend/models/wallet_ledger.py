@@ -0,0 +1,19 @@
+from sqlalchemy import Column, Integer, String, Float, DateTime, ForeignKey, Index
+from datetime import datetime
+from db.database import Base
+
+class WalletEntry(Base):
+    __tablename__ = "wallet_ledger"
+    __table_args__ = (
+        Index("ix_wallet_ledger_salesman_id_id", "salesman_id", "id"),  # statement, reconciliation
+    )
+
+    # Append-only: every change to salesmen.wallet_balance is one row here,
+    # so the balance always equals the sum of the salesman's entries
+    id = Column(Integer, primary_key=True, index=True)
+    salesman_id = Column(Integer, ForeignKey("salesmen.id", ondelete="CASCADE"), nullable=False)
+    type = Column(String, nullable=False)       # opening, incentive, reward, claim_hold, refund
+    amount = Column(Float, nullable=False)      # signed: credits > 0, debits < 0
+    claim_id = Column(Integer, ForeignKey("claims.id"), nullable=True)
+    source = Column(String, nullable=True)      # e.g. "sale", "actual_sales", reward period
+    created_at = Column(DateTime, default=datetime.utcnow)
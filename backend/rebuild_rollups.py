@@ -0,0 +1,20 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlalchemy.orm import Session
+from db.database import SessionLocal
+from models import claim, sale, streak  # relationship targets of Salesman
+from crud.rollup_crud import rebuild_rollup
+
+# Backfill / repair daily_sales_rollup from the sales and incentives tables.
+# Run once after migrating, and any time the rollup is suspected to have drifted.
+
+def rebuild_rollups():
+    db: Session = SessionLocal()
+    try:
+        rows = rebuild_rollup(db)
+    finally:
+        db.close()
+    print(f"✅ Daily sales rollup rebuilt ({rows} rows).")
+
+if __name__ == "__main__":
+    rebuild_rollups()
@@ -0,0 +1,30 @@
+import sys, os
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+from sqlalchemy.orm import Session
+from db.database import SessionLocal
+from models import claim, sale, streak  # relationship targets of Salesman
+from crud.wallet_crud import reconcile_wallets
+
+# Check salesmen.wallet_balance against the sum of each wallet's ledger entries.
+#
+#   python reconcile_wallets.py          # report mismatches
+#   python reconcile_wallets.py --fix    # also reset mismatched balances to the ledger sum
+
+def run(fix: bool = False):
+    db: Session = SessionLocal()
+    try:
+        result = reconcile_wallets(db, fix=fix)
+    finally:
+        db.close()
+
+    for m in result["mismatches"][:50]:
+        print(f"  salesman {m['salesman_id']}: balance {m['balance']:.2f}, ledger {m['ledger']:.2f}")
+    if result["mismatched"] > 50:
+        print(f"  ... and {result['mismatched'] - 50} more")
+    action = "fixed" if fix else "found"
+    print(f"✅ {result['checked']} wallets checked, {result['mismatched']} mismatches {action}.")
+    return result["mismatched"]
+
+if __name__ == "__main__":
+    mismatched = run("--fix" in sys.argv[1:])
+    sys.exit(1 if mismatched and "--fix" not in sys.argv[1:] else 0)
@@ -1,5 +1,5 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Optional, List
 from datetime import datetime
 
 # ✅ Salesman: Submits a claim (withdrawal request)
@@ -33,4 +33,29 @@ class ClaimUpdateRequest(BaseModel):
     
 class ClaimAmendApproveRequest(BaseModel):
     new_amount: float
-    new_remarks: Optional[str]
\ No newline at end of file
+    new_remarks: Optional[str]
+
+
+# Admin: bulk approve / reject (payout runs)
+MAX_BULK_CLAIMS = 10000
+
+class BulkApproveItem(BaseModel):
+    id: int
+    tx_hash: Optional[str] = None
+
+class BulkApproveRequest(BaseModel):
+    claims: List[BulkApproveItem] = Field(..., min_length=1, max_length=MAX_BULK_CLAIMS)
+
+class BulkRejectRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=MAX_BULK_CLAIMS)
+    reason: Optional[str] = None
+
+class BulkClaimResult(BaseModel):
+    id: int
+    status: str  # approved / rejected, or failed
+    reason: Optional[str] = None  # not_found, not_pending, salesman_not_found, amount_missing
+
+class BulkClaimResponse(BaseModel):
+    succeeded: int
+    failed: int
+    results: List[BulkClaimResult]
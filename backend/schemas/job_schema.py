@@ -0,0 +1,17 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class JobOut(BaseModel):
+    id: str
+    kind: str
+    status: str  # queued, running, succeeded, failed
+    processed: Optional[int] = 0
+    total: Optional[int] = None
+    error: Optional[str] = None
+    created_at: datetime
+    started_at: Optional[datetime] = None
+    finished_at: Optional[datetime] = None
+
+    class Config:
+        from_attributes = True
@@ -23,7 +23,7 @@ class SalesmanOut(BaseModel):
     mobile: str
     outlet: str
     verticle: str
-    wallet_balance: int
+    wallet_balance: float
     is_approved: bool
 
     class Config:
@@ -0,0 +1,14 @@
+from pydantic import BaseModel
+from typing import Optional
+from datetime import datetime
+
+class WalletEntryOut(BaseModel):
+    id: int
+    type: str  # opening, incentive, reward, claim_hold, refund
+    amount: float
+    claim_id: Optional[int] = None
+    source: Optional[str] = None
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -0,0 +1,144 @@
+# backend/services/barcode_index.py
+import bisect
+import threading
+import time
+from array import array
+from collections import defaultdict
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.product import Product
+
+GRAM = 3
+
+# Ranking buckets for search results, best first
+EXACT, PREFIX, SUFFIX, CONTAINS = 0, 1, 2, 3
+MATCH_LABELS = {EXACT: "exact", PREFIX: "prefix", SUFFIX: "suffix", CONTAINS: "contains"}
+
+
+def _grams(text: str) -> set:
+    return {text[i:i + GRAM] for i in range(len(text) - GRAM + 1)}
+
+
+class BarcodeIndex:
+    """
+    In-memory partial-barcode index over the product catalog.
+
+    - a sorted list of barcodes answers prefix queries with bisect;
+    - a trigram -> barcode-id posting list answers substring queries: only
+      barcodes in the rarest trigram's postings are checked.
+
+    Barcodes are searched case-insensitively, but each barcode keeps its own
+    entry: "ab12" and "AB12" are different products. Products are never deleted, so
+    the index only grows: add() is called after catalog writes, and
+    ensure_fresh() catches up with writes made by other workers.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._ids = {}                          # barcode (exact) -> id
+        self._barcodes = []                     # id -> barcode
+        self._sorted = []                       # (lowered barcode, id), sorted
+        self._postings = defaultdict(lambda: array("i"))
+        self.loaded = False
+        self.checked_at = 0.0
+
+    def __len__(self):
+        return len(self._barcodes)
+
+    def add(self, barcodes) -> int:
+        """
+        Index new barcodes; known ones are ignored. Returns how many were added.
+        """
+        with self._lock:
+            if not self.loaded:
+                return 0
+            return self._add(barcodes)
+
+    def _add(self, barcodes) -> int:
+        fresh = []
+        for barcode in barcodes:
+            if not barcode or barcode in self._ids:
+                continue
+            barcode_id = len(self._barcodes)
+            self._ids[barcode] = barcode_id
+            self._barcodes.append(barcode)
+            key = barcode.lower()
+            for gram in _grams(key):
+                self._postings[gram].append(barcode_id)
+            fresh.append((key, barcode_id))
+
+        if len(fresh) > 1000:
+            self._sorted = sorted(self._sorted + fresh)
+        else:
+            for entry in fresh:
+                bisect.insort(self._sorted, entry)
+        return len(fresh)
+
+    def ensure_fresh(self, db: Session) -> None:
+        """
+        Build on first use, then at most every BARCODE_INDEX_REFRESH seconds
+        compare against the product count and load any missing barcodes.
+        """
+        if self.loaded and time.monotonic() - self.checked_at < settings.BARCODE_INDEX_REFRESH:
+            return
+        with self._lock:
+            if self.loaded and time.monotonic() - self.checked_at < settings.BARCODE_INDEX_REFRESH:
+                return
+            if not self.loaded or db.query(func.count(Product.barcode)).scalar() != len(self):
+                self._add(barcode for (barcode,) in db.query(Product.barcode).yield_per(10000))
+                self.loaded = True
+            self.checked_at = time.monotonic()
+
+    def search(self, query: str, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Top `limit` (barcode, match) pairs containing `query`, ranked exact,
+        prefix, suffix, then any other substring; shorter barcodes first.
+        """
+        q = query.strip().lower()
+        if not q:
+            return []
+
+        with self._lock:
+            if len(q) < GRAM:
+                candidates = self._prefixed(q, limit * 50)
+            else:
+                postings = [self._postings.get(g) for g in _grams(q)]
+                if not all(postings):
+                    return []
+                rarest = min(postings, key=len)
+                candidates = [i for i in rarest if q in self._barcodes[i].lower()]
+            ranked = sorted(
+                (self._rank(q, barcode.lower()), len(barcode), barcode)
+                for barcode in (self._barcodes[i] for i in set(candidates))
+            )[:limit]
+            return [(barcode, MATCH_LABELS[rank]) for rank, _, barcode in ranked]
+
+    def _prefixed(self, q: str, cap: int) -> list[int]:
+        start = bisect.bisect_left(self._sorted, (q,))
+        found = []
+        for key, barcode_id in self._sorted[start:start + cap]:
+            if not key.startswith(q):
+                break
+            found.append(barcode_id)
+        return found
+
+    @staticmethod
+    def _rank(q: str, key: str) -> int:
+        if key == q:
+            return EXACT
+        if key.startswith(q):
+            return PREFIX
+        if key.endswith(q):
+            return SUFFIX
+        return CONTAINS
+
+
+barcode_index = BarcodeIndex()
+
+
+def search_barcodes(db: Session, query: str, limit: int = 10) -> list[tuple[str, str]]:
+    barcode_index.ensure_fresh(db)
+    return barcode_index.search(query, limit)
@@ -0,0 +1,97 @@
+# backend/services/catalog_cache.py
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.product import Product
+from models.trait_config import TraitConfig
+from services.barcode_index import search_barcodes
+from utils.ttl_cache import TTLCache, MISSING
+
+# Reference data for barcode scans and basket submits. Values are plain dicts
+# (never ORM instances) and unknown keys are cached as None.
+product_cache = TTLCache(settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL)
+trait_cache = TTLCache(settings.CATALOG_CACHE_SIZE, settings.CATALOG_CACHE_TTL)
+
+
+def _product_dict(product: Product) -> dict:
+    return {
+        "barcode": product.barcode,
+        "verticle": product.verticle,
+        "trait": product.trait,
+        "rsp": product.rsp,
+    }
+
+
+def resolve_barcode(db: Session, code: str) -> dict | None:
+    """
+    Product for a scanned code: exact barcode first, then the best partial
+    match from the barcode index.
+    """
+    def load():
+        product = db.query(Product).filter(Product.barcode == code).first()
+        if not product:
+            best = search_barcodes(db, code, limit=1)
+            if best:
+                product = db.query(Product).filter(Product.barcode == best[0][0]).first()
+        return _product_dict(product) if product else None
+
+    return product_cache.get_or_load(("scan", code), load)
+
+
+def get_products(db: Session, barcodes) -> dict:
+    """
+    Map barcode -> product dict for every known barcode, fetching all cache
+    misses with a single IN query.
+    """
+    found = {}
+    missing = []
+    for barcode in set(barcodes):
+        cached = product_cache.get(barcode)
+        if cached is MISSING:
+            missing.append(barcode)
+        elif cached is not None:
+            found[barcode] = cached
+
+    if missing:
+        version = product_cache.version
+        loaded = {
+            p.barcode: _product_dict(p)
+            for p in db.query(Product).filter(Product.barcode.in_(missing)).all()
+        }
+        for barcode in missing:
+            product_cache.set(barcode, loaded.get(barcode), version)
+        found.update(loaded)
+
+    return found
+
+
+def get_trait_map(db: Session) -> dict:
+    """
+    Map trait name -> {"trait", "percentage", "is_visible"} for all trait configs.
+    """
+    def load():
+        return {
+            t.trait: {"trait": t.trait, "percentage": t.percentage, "is_visible": t.is_visible}
+            for t in db.query(TraitConfig).all()
+        }
+
+    return trait_cache.get_or_load("all", load)
+
+
+def get_trait(db: Session, trait: str) -> dict | None:
+    return get_trait_map(db).get(trait)
+
+
+def invalidate_products() -> None:
+    product_cache.invalidate()
+
+
+def invalidate_traits() -> None:
+    trait_cache.invalidate()
+
+
+def cache_stats() -> dict:
+    return {
+        "products": product_cache.stats(),
+        "traits": trait_cache.stats(),
+    }
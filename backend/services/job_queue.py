@@ -0,0 +1,222 @@
+# backend/services/job_queue.py
+import logging
+import os
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+
+from fastapi import HTTPException
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from config import settings
+from db.database import SessionLocal
+from models.job import Job
+
+logger = logging.getLogger(__name__)
+
+_executor = ThreadPoolExecutor(max_workers=settings.JOB_WORKERS, thread_name_prefix="job")
+
+# Live progress of jobs running in this process: job_id -> (processed, total).
+# Kept in memory so a job never has to commit its own open transaction to report
+# it; the heartbeat copies it to the jobs row for polls served by other workers.
+_progress = {}
+_live = set()  # ids of jobs queued or running in this process
+_progress_lock = threading.Lock()
+
+_heartbeat_thread = None
+_heartbeat_stop = threading.Event()
+
+
+def _result_dir() -> str:
+    return settings.JOB_RESULT_DIR or os.path.join(tempfile.gettempdir(), "incentive_jobs")
+
+
+def job_file(suffix: str) -> str:
+    """
+    New file path under the job result directory, for jobs that produce a download.
+    """
+    result_dir = _result_dir()
+    os.makedirs(result_dir, exist_ok=True)
+    purge_expired_results()
+    return os.path.join(result_dir, f"{uuid.uuid4().hex}{suffix}")
+
+
+def remove_result_file(path: str) -> None:
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def purge_expired_results() -> int:
+    """
+    Delete result files older than JOB_RESULT_TTL, including those of jobs
+    that were never downloaded. Their jobs then answer 410 for the result.
+    """
+    cutoff = time.time() - settings.JOB_RESULT_TTL
+    removed = 0
+    try:
+        entries = list(os.scandir(_result_dir()))
+    except FileNotFoundError:
+        return 0
+    for entry in entries:
+        try:
+            if entry.is_file() and entry.stat().st_mtime < cutoff:
+                os.remove(entry.path)
+                removed += 1
+        except FileNotFoundError:
+            pass  # removed by a download or another worker meanwhile
+    return removed
+
+
+def submit_job(db: Session, kind: str, fn, created_by: str = None) -> Job:
+    """
+    Record a queued job and hand it to the worker pool.
+    fn(db, progress) runs with its own session; its return value becomes the job result.
+    A result containing "file_path" is served as a download by the jobs API.
+    """
+    job = Job(id=uuid.uuid4().hex, kind=kind, status="queued", created_by=created_by)
+    job.heartbeat_at = job.created_at = datetime.utcnow()
+    db.add(job)
+    db.commit()
+    db.refresh(job)
+
+    with _progress_lock:
+        _live.add(job.id)
+    _start_heartbeat()
+    _executor.submit(_run_job, job.id, fn)
+    return job
+
+
+def _run_job(job_id: str, fn) -> None:
+    db = SessionLocal()
+    try:
+        _update_job(db, job_id, status="running", started_at=datetime.utcnow())
+
+        def progress(processed: int, total: int = None):
+            with _progress_lock:
+                _progress[job_id] = (processed, total)
+
+        try:
+            result = fn(db, progress)
+            if not isinstance(result, dict):
+                result = {"message": result}
+            status, error = "succeeded", None
+        except Exception as e:
+            logger.exception("Job %s failed", job_id)
+            db.rollback()
+            # Only HTTPException's detail is a message (SQLAlchemy errors have detail=[])
+            error = str(e.detail) if isinstance(e, HTTPException) else str(e)
+            result, status = None, "failed"
+
+        processed, total = get_progress(job_id) or (None, None)
+        fields = dict(status=status, result=result, error=error, finished_at=datetime.utcnow())
+        if processed is not None:
+            fields.update(processed=processed, total=total)
+        try:
+            _update_job(db, job_id, **fields)
+        except Exception as e:
+            # e.g. a result that won't serialize: don't leave the job "running"
+            logger.exception("Could not record the outcome of job %s", job_id)
+            db.rollback()
+            if result and "file_path" in result:
+                remove_result_file(result["file_path"])
+            _update_job(
+                db, job_id, status="failed", result=None,
+                error=f"Could not record job result: {e}", finished_at=datetime.utcnow()
+            )
+    except Exception:
+        logger.exception("Could not update job %s", job_id)
+    finally:
+        with _progress_lock:
+            _progress.pop(job_id, None)
+            _live.discard(job_id)
+        db.close()
+
+
+def _update_job(db: Session, job_id: str, **fields) -> None:
+    db.query(Job).filter(Job.id == job_id).update(fields, synchronize_session=False)
+    db.commit()
+
+
+def get_progress(job_id: str):
+    with _progress_lock:
+        return _progress.get(job_id)
+
+
+def get_job(db: Session, job_id: str) -> Job | None:
+    return db.query(Job).filter(Job.id == job_id).first()
+
+
+def list_jobs(db: Session, limit: int = 50) -> list[Job]:
+    return db.query(Job).order_by(Job.created_at.desc()).limit(limit).all()
+
+
+def fail_interrupted_jobs(db: Session) -> int:
+    """
+    Mark queued/running jobs whose worker has stopped sending heartbeats as
+    failed. Jobs of other live workers keep beating and are left alone.
+    """
+    cutoff = datetime.utcnow() - timedelta(seconds=settings.JOB_STALE_AFTER)
+    count = (
+        db.query(Job)
+        .filter(
+            Job.status.in_(["queued", "running"]),
+            func.coalesce(Job.heartbeat_at, Job.created_at) < cutoff
+        )
+        .update(
+            {"status": "failed", "error": "Interrupted: its worker stopped", "finished_at": datetime.utcnow()},
+            synchronize_session=False
+        )
+    )
+    db.commit()
+    return count
+
+
+def _beat() -> None:
+    """
+    Refresh heartbeat_at and progress of this process's jobs, on a session of
+    its own, then fail jobs abandoned by dead workers.
+    """
+    with _progress_lock:
+        live = {job_id: _progress.get(job_id) for job_id in _live}
+    db = SessionLocal()
+    try:
+        now = datetime.utcnow()
+        for job_id, progress in live.items():
+            fields = {"heartbeat_at": now}
+            if progress is not None:
+                fields.update(processed=progress[0], total=progress[1])
+            # Status filter: don't overwrite the final progress of a job that just finished
+            db.query(Job).filter(Job.id == job_id, Job.status.in_(["queued", "running"])).update(
+                fields, synchronize_session=False
+            )
+        db.commit()
+        fail_interrupted_jobs(db)
+    except Exception:
+        db.rollback()
+        logger.exception("Job heartbeat failed")
+    finally:
+        db.close()
+
+
+def _heartbeat_loop() -> None:
+    while not _heartbeat_stop.wait(settings.JOB_HEARTBEAT_INTERVAL):
+        _beat()
+
+
+def _start_heartbeat() -> None:
+    global _heartbeat_thread
+    with _progress_lock:
+        if _heartbeat_thread is None:
+            _heartbeat_thread = threading.Thread(target=_heartbeat_loop, name="job-heartbeat", daemon=True)
+            _heartbeat_thread.start()
+
+
+def shutdown() -> None:
+    _heartbeat_stop.set()
+    _executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,112 @@
+# backend/services/leaderboard_cache.py
+import asyncio
+import hashlib
+import json
+import threading
+from datetime import datetime, timezone
+from email.utils import format_datetime
+
+from fastapi import Request, Response
+from fastapi.encoders import jsonable_encoder
+
+from config import settings
+from utils.ttl_cache import TTLCache, MISSING
+
+# Serialized leaderboard snapshots keyed by board ("day", "week", "month",
+# "streak"). Writes that move the standings invalidate them; the TTL bounds
+# how stale a board can get in another worker process or across midnight.
+leaderboard_cache = TTLCache(64, settings.LEADERBOARD_CACHE_TTL)
+
+# One loader per board at a time, so a burst of polls after an
+# invalidation runs a single aggregate
+_load_locks: dict[str, threading.Lock] = {}
+_locks_guard = threading.Lock()
+
+
+def _snapshot(payload) -> dict:
+    body = json.dumps(jsonable_encoder(payload), separators=(",", ":")).encode("utf-8")
+    return {
+        "body": body,
+        "etag": f'"{hashlib.sha1(body).hexdigest()}"',
+        "generated_at": datetime.now(timezone.utc),
+    }
+
+
+def get_snapshot(key: str, loader) -> dict:
+    """
+    Cached snapshot for `key`, built from loader() on a miss.
+    """
+    snapshot = leaderboard_cache.get(key)
+    if snapshot is not MISSING:
+        return snapshot
+
+    with _locks_guard:
+        lock = _load_locks.setdefault(key, threading.Lock())
+    with lock:
+        # Another request may have loaded it while we waited
+        snapshot = leaderboard_cache.get(key)
+        if snapshot is MISSING:
+            version = leaderboard_cache.version
+            snapshot = _snapshot(loader())
+            leaderboard_cache.set(key, snapshot, version)
+    return snapshot
+
+
+# asyncio counterpart of _load_locks for async routes
+_async_load_locks: dict[str, asyncio.Lock] = {}
+
+
+async def get_snapshot_async(key: str, loader) -> dict:
+    """
+    get_snapshot() for async routes: `loader` is awaited on a miss, and
+    waiting requests yield to the event loop instead of blocking it.
+    """
+    snapshot = leaderboard_cache.get(key)
+    if snapshot is not MISSING:
+        return snapshot
+
+    lock = _async_load_locks.setdefault(key, asyncio.Lock())
+    async with lock:
+        snapshot = leaderboard_cache.get(key)
+        if snapshot is MISSING:
+            version = leaderboard_cache.version
+            snapshot = _snapshot(await loader())
+            leaderboard_cache.set(key, snapshot, version)
+    return snapshot
+
+
+def _etag_matches(if_none_match: str | None, etag: str) -> bool:
+    if not if_none_match:
+        return False
+    tags = [t.strip().removeprefix("W/") for t in if_none_match.split(",")]
+    return "*" in tags or etag in tags
+
+
+def snapshot_response(request: Request, snapshot: dict) -> Response:
+    """
+    JSON response for a leaderboard snapshot, honouring If-None-Match.
+    The body is unchanged; ETag / Last-Modified carry the snapshot identity.
+    """
+    headers = {
+        "ETag": snapshot["etag"],
+        "Last-Modified": format_datetime(snapshot["generated_at"], usegmt=True),
+        "Cache-Control": "no-cache",
+    }
+    if _etag_matches(request.headers.get("if-none-match"), snapshot["etag"]):
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot["body"], media_type="application/json", headers=headers)
+
+
+def cached_leaderboard(request: Request, key: str, loader) -> Response:
+    return snapshot_response(request, get_snapshot(key, loader))
+
+
+def invalidate_leaderboards(key=MISSING) -> None:
+    """
+    Drop one board's snapshot, or all of them.
+    """
+    leaderboard_cache.invalidate(key)
+
+
+def leaderboard_cache_stats() -> dict:
+    return leaderboard_cache.stats()
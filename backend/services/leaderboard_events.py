@@ -0,0 +1,146 @@
+# backend/services/leaderboard_events.py
+import asyncio
+import json
+import logging
+
+from config import settings
+from crud.leaderboard_crud import leaderboard_payload
+from db.async_database import AsyncSessionLocal
+from services.leaderboard_cache import get_snapshot_async
+
+logger = logging.getLogger(__name__)
+
+PUSH_BOARDS = ("day", "week", "month")
+
+# Events a slow subscriber may have waiting. Every event carries the full
+# top list, so dropping older ones on overflow loses nothing.
+SUBSCRIBER_QUEUE_SIZE = 8
+
+
+def _rows(payload) -> list[dict]:
+    # day is a bare list, week/month wrap it as {"label", "data"}
+    return payload["data"] if isinstance(payload, dict) else payload
+
+
+def _delta(previous: list[dict], current: list[dict]) -> dict:
+    """
+    Entries whose rank or sales moved, and names that left the board.
+    """
+    before = {row["name"]: (rank, row["sales"]) for rank, row in enumerate(previous, start=1)}
+    changed = []
+    for rank, row in enumerate(current, start=1):
+        old = before.get(row["name"])
+        if old != (rank, row["sales"]):
+            changed.append({
+                "name": row["name"],
+                "sales": row["sales"],
+                "rank": rank,
+                "previous_rank": old[0] if old else None,
+            })
+    names = {row["name"] for row in current}
+    return {"changed": changed, "removed": [name for name in before if name not in names]}
+
+
+class LeaderboardBroadcaster:
+    """
+    In-process pub/sub for leaderboard standings.
+
+    Subscribers are asyncio queues on the server's event loop. Writers call
+    notify() from any thread; changes are coalesced for PUSH_DEBOUNCE seconds,
+    each board with subscribers is recomputed once (through the snapshot
+    cache), and a delta is fanned out only if the standings moved.
+    While anyone is subscribed the boards are also rechecked every
+    LEADERBOARD_CACHE_TTL seconds, which picks up sales taken by other
+    worker processes and the rollover at midnight.
+    """
+
+    def __init__(self):
+        self.loop: asyncio.AbstractEventLoop | None = None
+        self.subscribers: dict[str, set[asyncio.Queue]] = {board: set() for board in PUSH_BOARDS}
+        self.standings: dict[str, dict] = {}
+        self._pending: asyncio.Task | None = None
+        self._ticker: asyncio.Task | None = None
+
+    def connections(self) -> int:
+        return sum(len(queues) for queues in self.subscribers.values())
+
+    async def board_payload(self, board: str):
+        async with AsyncSessionLocal() as db:
+            snapshot = await get_snapshot_async(board, lambda: db.run_sync(leaderboard_payload, board))
+        return json.loads(snapshot["body"])
+
+    async def subscribe(self, board: str) -> tuple[asyncio.Queue, dict]:
+        """
+        Register a subscriber; returns its queue and the current standings.
+        """
+        self.loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.subscribers[board].add(queue)
+        if self._ticker is None or self._ticker.done():
+            self._ticker = asyncio.create_task(self._tick())
+
+        payload = self.standings.get(board)
+        if payload is None:
+            payload = await self.board_payload(board)
+            self.standings.setdefault(board, payload)
+        return queue, payload
+
+    def unsubscribe(self, board: str, queue: asyncio.Queue) -> None:
+        self.subscribers[board].discard(queue)
+        if not self.subscribers[board]:
+            # Nobody is watching; don't diff against a stale board later
+            self.standings.pop(board, None)
+
+    def notify(self) -> None:
+        """
+        Standings may have changed. Safe to call from any thread.
+        """
+        loop = self.loop
+        if loop is None or loop.is_closed() or not self.connections():
+            return
+        try:
+            loop.call_soon_threadsafe(self._schedule)
+        except RuntimeError:
+            # Loop shut down between the check and the call
+            pass
+
+    def _schedule(self) -> None:
+        if self._pending is None or self._pending.done():
+            self._pending = asyncio.create_task(self._recompute(settings.LEADERBOARD_PUSH_DEBOUNCE))
+
+    async def _tick(self) -> None:
+        while self.connections():
+            await asyncio.sleep(settings.LEADERBOARD_CACHE_TTL)
+            self._schedule()
+
+    async def _recompute(self, delay: float) -> None:
+        await asyncio.sleep(delay)
+        for board in PUSH_BOARDS:
+            if not self.subscribers[board]:
+                continue
+            try:
+                payload = await self.board_payload(board)
+            except Exception:
+                logger.exception("Leaderboard recompute failed for %s", board)
+                continue
+
+            previous = self.standings.get(board)
+            self.standings[board] = payload
+            if previous is None:
+                continue
+            delta = _delta(_rows(previous), _rows(payload))
+            if delta["changed"] or delta["removed"]:
+                self.publish(board, {"board": board, "standings": payload, **delta})
+
+    def publish(self, board: str, event: dict) -> None:
+        for queue in list(self.subscribers[board]):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait(event)
+
+
+broadcaster = LeaderboardBroadcaster()
+
+
+def notify_standings_changed() -> None:
+    broadcaster.notify()
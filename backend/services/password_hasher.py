@@ -0,0 +1,100 @@
+# backend/services/password_hasher.py
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from fastapi import HTTPException
+
+from config import settings
+from utils.hash import hash_password, verify_and_update
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt on its own bounded thread pool, so a burst of logins neither
+    blocks the event loop nor ties up FastAPI's shared threadpool.
+
+    At most `max_queue` calls wait for a worker; beyond that callers get a
+    503 with Retry-After instead of an ever-growing backlog.
+    """
+
+    def __init__(self, workers: int, max_queue: int):
+        self.workers = workers
+        self.max_queue = max_queue
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="bcrypt")
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.running = 0
+        self.peak_queued = 0
+        self.completed = 0
+        self.rejected = 0
+        self._wait_total = 0.0
+        self._work_total = 0.0
+
+    async def run(self, fn, *args):
+        with self._lock:
+            if self.queued >= self.max_queue:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Too many logins in progress, please retry",
+                    headers={"Retry-After": "1"},
+                )
+            self.queued += 1
+            self.peak_queued = max(self.peak_queued, self.queued)
+        submitted = time.perf_counter()
+
+        def task():
+            started = time.perf_counter()
+            with self._lock:
+                self.queued -= 1
+                self.running += 1
+                self._wait_total += started - submitted
+            try:
+                return fn(*args)
+            finally:
+                with self._lock:
+                    self.running -= 1
+                    self.completed += 1
+                    self._work_total += time.perf_counter() - started
+
+        future = self._executor.submit(task)
+
+        def release_if_cancelled(f):
+            # A task cancelled before it started (e.g. on shutdown) never ran
+            # the decrement in task()
+            if f.cancelled():
+                with self._lock:
+                    self.queued -= 1
+
+        future.add_done_callback(release_if_cancelled)
+        return await asyncio.wrap_future(future)
+
+    async def hash(self, password: str) -> str:
+        return await self.run(hash_password, password)
+
+    async def verify_and_update(self, password: str, hashed: str) -> tuple[bool, str | None]:
+        return await self.run(verify_and_update, password, hashed)
+
+    def stats(self) -> dict:
+        with self._lock:
+            done = self.completed
+            return {
+                "workers": self.workers,
+                "max_queue": self.max_queue,
+                "rounds": settings.BCRYPT_ROUNDS,
+                "queued": self.queued,
+                "running": self.running,
+                "peak_queued": self.peak_queued,
+                "completed": done,
+                "rejected": self.rejected,
+                "avg_wait_ms": round(self._wait_total / done * 1000, 2) if done else None,
+                "avg_hash_ms": round(self._work_total / done * 1000, 2) if done else None,
+            }
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+password_hasher = PasswordHasher(settings.PASSWORD_HASH_WORKERS, settings.PASSWORD_HASH_QUEUE)
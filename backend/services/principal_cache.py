@@ -0,0 +1,77 @@
+# backend/services/principal_cache.py
+from types import SimpleNamespace
+
+from sqlalchemy import inspect
+
+from config import settings
+from utils.ttl_cache import TTLCache, MISSING
+
+# (role, sub) -> Principal for the admin / salesman a token names, so
+# authenticated requests skip the user lookup. Writes that change what
+# routes read from the principal (approval, deletion, wallet balance)
+# invalidate it; other workers catch up within the TTL.
+principal_cache = TTLCache(settings.PRINCIPAL_CACHE_SIZE, settings.PRINCIPAL_CACHE_TTL)
+
+# salesman id -> mobile, for invalidating by id from crud code
+_salesman_subs: dict[int, str] = {}
+
+SECRET_COLUMNS = {"password", "hashed_password"}
+
+
+class Principal(SimpleNamespace):
+    """
+    Detached snapshot of the authenticated user's columns, without password
+    hashes. Read-only: crud code loads the row itself before writing.
+    """
+
+
+def _principal(user) -> Principal:
+    return Principal(**{
+        attr.key: getattr(user, attr.key)
+        for attr in inspect(user).mapper.column_attrs
+        if attr.key not in SECRET_COLUMNS
+    })
+
+
+def cached_principal(role: str, payload: dict):
+    """
+    Cached principal for a decoded token, or MISSING. An entry older than
+    the token's "ver" claim counts as missing, so it is reloaded.
+    """
+    principal = principal_cache.get((role, payload["sub"]))
+    if principal is MISSING:
+        return MISSING
+    if payload.get("ver", principal.token_version) > principal.token_version:
+        return MISSING
+    return principal
+
+
+def remember_principal(role: str, sub: str, user, version: int) -> Principal | None:
+    """
+    Cache the freshly loaded user; `version` is principal_cache.version from
+    before the load. Unknown users are not cached.
+    """
+    if user is None:
+        return None
+    principal = _principal(user)
+    if role == "salesman":
+        _salesman_subs[principal.id] = sub
+    principal_cache.set((role, sub), principal, version)
+    return principal
+
+
+def invalidate_principal(role: str, sub: str) -> None:
+    principal_cache.invalidate((role, sub))
+
+
+def invalidate_salesmen(salesman_ids) -> None:
+    """
+    Drop cached salesman principals by id, e.g. after a wallet change.
+    """
+    for salesman_id in salesman_ids:
+        # Unknown ids still bump the cache version, discarding loads in flight
+        principal_cache.invalidate(("salesman", _salesman_subs.get(salesman_id)))
+
+
+def principal_cache_stats() -> dict:
+    return principal_cache.stats()
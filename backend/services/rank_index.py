@@ -0,0 +1,193 @@
+# backend/services/rank_index.py
+import threading
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+
+from sortedcontainers import SortedList
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from config import settings
+from models.incentive import Incentive
+
+
+class RankIndex:
+    """
+    Salesmen ordered by total visible incentive, for /rank lookups.
+
+    Keeps salesman_id -> total plus a SortedList of (-total, salesman_id),
+    so "my rank" and "who is around me" are O(log n) lookups and an update
+    is O(log n) too. Ranks are competition style: 1 + the number of
+    salesmen with a strictly higher total. Only salesmen with a visible
+    incentive are ranked.
+
+    apply() is called after incentive writes in this process; ensure_fresh()
+    rebuilds from the DB every RANK_INDEX_REFRESH seconds to pick up writes
+    from other workers and correct float drift. Only one caller rebuilds at
+    a time; the others keep reading the current snapshot.
+
+    Writers commit inside committing(), which hands out a sequence number.
+    A rebuild waits for in-flight commits, notes the last number and starts
+    its query before letting new commits through, so deltas numbered up to
+    that point are in its snapshot and later ones are replayed onto it.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._changed = threading.Condition(self._lock)
+        self._rebuild_lock = threading.Lock()  # single-flight for rebuild()
+        self._totals = {}               # salesman_id -> total
+        self._counts = {}               # salesman_id -> number of visible incentives
+        self._keys = SortedList()       # (-total, salesman_id)
+        self._seq = 0                   # last sequence number handed out
+        self._in_flight = 0             # commits inside committing()
+        self._gate_closed = False       # a rebuild is starting its query
+        self._pending = None            # (seq, deltas) applied during a rebuild, else None
+        self.loaded = False
+        self.built_at = 0.0
+
+    def __len__(self):
+        return len(self._keys)
+
+    @contextmanager
+    def committing(self):
+        """
+        Wrap the commit of a write whose deltas go to apply(); yields the
+        sequence number to pass along with them.
+        """
+        with self._changed:
+            while self._gate_closed:
+                self._changed.wait()
+            self._seq += 1
+            seq = self._seq
+            self._in_flight += 1
+        try:
+            yield seq
+        finally:
+            with self._changed:
+                self._in_flight -= 1
+                self._changed.notify_all()
+
+    def rebuild(self, db: Session) -> None:
+        with self._rebuild_lock:
+            self._rebuild(db)
+
+    def _rebuild(self, db: Session) -> None:
+        with self._changed:
+            self._gate_closed = True
+            while self._in_flight:
+                self._changed.wait()
+            snapshot_seq = self._seq
+            self._pending = []
+        try:
+            try:
+                result = db.execute(
+                    select(Incentive.salesman_id, func.sum(Incentive.amount), func.count(Incentive.id))
+                    .where(Incentive.is_visible == True, Incentive.salesman_id.isnot(None))
+                    .group_by(Incentive.salesman_id)
+                    .execution_options(stream_results=True)
+                )
+                # The first fetch has fixed the query's snapshot
+                rows = result.fetchmany(1)
+            finally:
+                with self._changed:
+                    self._gate_closed = False
+                    self._changed.notify_all()
+            rows += result.fetchall()
+
+            totals = {sid: float(total or 0.0) for sid, total, _ in rows}
+            with self._lock:
+                self._totals = totals
+                self._counts = {sid: count for sid, _, count in rows}
+                self._keys = SortedList((-total, sid) for sid, total in totals.items())
+                for seq, deltas in self._pending:
+                    if seq is None or seq > snapshot_seq:
+                        self._apply(deltas)
+                self.loaded = True
+                self.built_at = time.monotonic()
+        finally:
+            with self._lock:
+                self._pending = None
+
+    def ensure_fresh(self, db: Session) -> None:
+        if self.loaded and time.monotonic() - self.built_at < settings.RANK_INDEX_REFRESH:
+            return
+        if self.loaded:
+            # Serve the current snapshot while another request rebuilds
+            if not self._rebuild_lock.acquire(blocking=False):
+                return
+        else:
+            self._rebuild_lock.acquire()
+        try:
+            if self.loaded and time.monotonic() - self.built_at < settings.RANK_INDEX_REFRESH:
+                return  # rebuilt while we waited
+            self._rebuild(db)
+        finally:
+            self._rebuild_lock.release()
+
+    def apply(self, deltas: dict, seq: int | None = None) -> None:
+        """
+        Apply {salesman_id: (change in visible total, change in visible count)}
+        committed under committing() as `seq`. Ignored until first built,
+        unless a rebuild is in progress.
+        """
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append((seq, deltas))
+            if self.loaded:
+                self._apply(deltas)
+
+    def _apply(self, deltas: dict) -> None:
+        for sid, (amount, count) in deltas.items():
+            old = self._totals.pop(sid, None)
+            if old is not None:
+                self._keys.remove((-old, sid))
+            count += self._counts.pop(sid, 0)
+            if count > 0:
+                total = (old or 0.0) + amount
+                self._totals[sid] = total
+                self._counts[sid] = count
+                self._keys.add((-total, sid))
+
+    def rank(self, salesman_id: int) -> int | None:
+        with self._lock:
+            total = self._totals.get(salesman_id)
+            if total is None:
+                return None
+            return self._rank_of(total)
+
+    def _rank_of(self, total: float) -> int:
+        # Keys sort by -total; everything before the first key for `total` is strictly higher
+        return self._keys.bisect_left((-total, float("-inf"))) + 1
+
+    def neighbors(self, salesman_id: int, radius: int = 2) -> list[dict]:
+        """
+        Up to `radius` salesmen either side of `salesman_id`, in rank order.
+        """
+        with self._lock:
+            total = self._totals.get(salesman_id)
+            if total is None:
+                return []
+            position = self._keys.index((-total, salesman_id))
+            window = self._keys.islice(max(0, position - radius), position + radius + 1)
+            return [
+                {"salesman_id": sid, "rank": self._rank_of(-neg_total), "total_incentive": -neg_total}
+                for neg_total, sid in window
+            ]
+
+
+rank_index = RankIndex()
+
+
+def record_incentives(rows, seq: int | None = None) -> None:
+    """
+    Apply freshly written incentive rows (dicts with salesman_id, amount and
+    optionally is_visible) to the rank index; `seq` is from committing().
+    """
+    deltas = defaultdict(lambda: [0.0, 0])
+    for row in rows:
+        if row.get("is_visible", True):
+            deltas[row["salesman_id"]][0] += row["amount"] or 0.0
+            deltas[row["salesman_id"]][1] += 1
+    rank_index.apply(deltas, seq)
@@ -1,7 +1,9 @@
 from datetime import date, timedelta
 from sqlalchemy.orm import Session
-from sqlalchemy import func, extract
-from models.sale import Sale  # ✅ changed from actual_sale
+from crud.rollup_crud import top_sales, rollup_incentives
+from crud.wallet_crud import post_entries, REWARD
+from services.rank_index import rank_index, record_incentives
+from services.principal_cache import invalidate_salesmen
 from models.salesman import Salesman
 from models.incentive import Incentive
 from models.leaderboardincentive import LeaderboardIncentive
@@ -22,31 +24,18 @@ def reward_top_salesman(db: Session, period: str):
     if already:
         return f"Already rewarded for {period} ({reward_date})"
 
-    # Time filter
-    if period == "day":
-        sales_filter = func.date(Sale.timestamp) == today
-    elif period == "week":
-        sales_filter = extract("week", Sale.timestamp) == extract("week", func.now())
-    elif period == "month":
-        sales_filter = extract("month", Sale.timestamp) == extract("month", func.now())
-    else:
+    if period not in ("day", "week", "month"):
         return "Invalid period"
 
-    # Get top salesman
-    top = (
-        db.query(Sale.salesman_id, func.sum(Sale.amount).label("total"))
-        .filter(sales_filter)
-        .group_by(Sale.salesman_id)
-        .order_by(func.sum(Sale.amount).desc())
-        .first()
-    )
+    # Get top salesman from the daily rollup, reward_date..today
+    top = next(iter(top_sales(db, reward_date, today, limit=1)), None)
 
     if not top:
         return f"No top performer found for {period}"
 
-    salesman = db.query(Salesman).filter_by(id=top.salesman_id).first()
+    salesman = db.query(Salesman).filter_by(id=top.id).first()
     if not salesman:
-        return f"Salesman not found (ID: {top.salesman_id})"
+        return f"Salesman not found (ID: {top.id})"
 
     incentive_config = db.query(LeaderboardIncentive).first()
     if not incentive_config:
@@ -62,7 +51,7 @@ def reward_top_salesman(db: Session, period: str):
         return f"No reward set for {period}"
 
     # Apply reward
-    salesman.wallet_balance += reward_amount
+    post_entries(db, [{"salesman_id": salesman.id, "type": REWARD, "amount": reward_amount, "source": period}])
     reward = Incentive(
         salesman_id=salesman.id,
         amount=reward_amount,
@@ -76,5 +65,9 @@ def reward_top_salesman(db: Session, period: str):
     )
 
     db.add_all([reward, log])
-    db.commit()
+    rollup_incentives(db, [{"salesman_id": salesman.id, "amount": reward_amount}])
+    with rank_index.committing() as seq:
+        db.commit()
+    record_incentives([{"salesman_id": salesman.id, "amount": reward_amount}], seq)
+    invalidate_salesmen([salesman.id])
     return f"✅ ₹{reward_amount} given to {salesman.name} for {period} (sales: ₹{top.total})"
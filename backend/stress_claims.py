@@ -0,0 +1,174 @@
+import sys, os, tempfile, threading, time, uuid
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+# Multi-threaded stress test for claim submission and review.
+# Starts the app on a local port against a throwaway database
+# (STRESS_DATABASE_URL, default a temp SQLite file) and fires each
+# scenario from many threads at once; exits non-zero if any invariant breaks.
+# Never point it at real data.
+#
+#   python stress_claims.py [threads]     # default 40
+
+STRESS_DB = os.getenv("STRESS_DATABASE_URL") or f"sqlite:///{tempfile.mkdtemp()}/stress.db"
+os.environ["DATABASE_URL"] = STRESS_DB
+os.environ.setdefault("BCRYPT_ROUNDS", "4")
+
+from concurrent.futures import ThreadPoolExecutor
+import logging
+import httpx
+import uvicorn
+from sqlalchemy import func
+import main
+logging.getLogger().setLevel(logging.WARNING)  # main.py logs at DEBUG
+from db.database import Base, engine, SessionLocal
+from models.admin import Admin
+from models.salesman import Salesman
+from models.claim import Claim
+from crud.wallet_crud import post_entries, reconcile_wallets, OPENING
+from utils.hash import hash_password
+
+PORT = int(os.getenv("STRESS_PORT", "8766"))
+BASE_URL = f"http://127.0.0.1:{PORT}"
+failures = []
+
+
+def check(label: str, ok: bool, detail=""):
+    print(f"  {'PASS' if ok else 'FAIL'}  {label} {detail}")
+    if not ok:
+        failures.append(label)
+
+
+def seed():
+    Base.metadata.drop_all(engine)
+    Base.metadata.create_all(engine)
+    db = SessionLocal()
+    db.add_all([
+        Admin(name="stress admin", mobile="9000000000", hashed_password=hash_password("pw"), is_active=True),
+        Salesman(name="stress", mobile="9000000001", outlet="O1", verticle="v",
+                 password=hash_password("pw"), is_approved=True, wallet_balance=0.0),
+    ])
+    db.commit()
+    db.close()
+
+
+def credit(amount: float):
+    db = SessionLocal()
+    salesman_id = db.query(Salesman.id).filter_by(mobile="9000000001").scalar()
+    post_entries(db, [{"salesman_id": salesman_id, "type": OPENING, "amount": amount, "source": "stress"}])
+    db.commit()
+    db.close()
+
+
+def snapshot() -> tuple[float, int]:
+    db = SessionLocal()
+    balance = db.query(Salesman.wallet_balance).filter_by(mobile="9000000001").scalar()
+    claims = db.query(func.count(Claim.id)).scalar()
+    db.close()
+    return balance, claims
+
+
+def login(mobile: str) -> dict:
+    r = httpx.post(f"{BASE_URL}/api/auth/login", json={"mobile": mobile, "password": "pw"})
+    r.raise_for_status()
+    return {"Authorization": f"Bearer {r.json()['access_token']}"}
+
+
+def hammer(threads: int, request) -> list[httpx.Response]:
+    """
+    Run request(client, i) from `threads` threads released at the same instant.
+    """
+    barrier = threading.Barrier(threads)
+
+    def one(i):
+        with httpx.Client(base_url=BASE_URL, timeout=60) as client:
+            barrier.wait()
+            return request(client, i)
+
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return list(pool.map(one, range(threads)))
+
+
+def statuses(responses) -> dict:
+    counts = {}
+    for r in responses:
+        counts[r.status_code] = counts.get(r.status_code, 0) + 1
+    return counts
+
+
+def run_stress(threads: int = 40):
+    print(f"Database {STRESS_DB}, {threads} threads per scenario")
+    seed()
+    server = uvicorn.Server(uvicorn.Config(main.app, host="127.0.0.1", port=PORT, log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.05)
+
+    try:
+        salesman = login("9000000001")
+        admin = login("9000000000")
+
+        print("\n1. Double spend: parallel withdrawals of 10 against a balance of 100")
+        credit(100)
+        responses = hammer(threads, lambda c, i: c.post("/api/claim", headers=salesman, json={"amount": 10}))
+        balance, claims = snapshot()
+        counts = statuses(responses)
+        check("exactly 10 claims accepted", counts.get(200) == min(10, threads), counts)
+        check("balance never negative", balance >= 0, f"balance={balance}")
+        check("balance + claims = 100", abs(balance + 10 * claims - 100) < 0.005, f"claims={claims}")
+
+        print("\n2. Retries: one Idempotency-Key sent from every thread")
+        credit(50)
+        before_balance, before_claims = snapshot()
+        key = uuid.uuid4().hex
+        responses = hammer(threads, lambda c, i: c.post(
+            "/api/claim", headers={**salesman, "Idempotency-Key": key}, json={"amount": 5}
+        ))
+        balance, claims = snapshot()
+        ids = {r.json()["id"] for r in responses if r.status_code == 200}
+        replayed = sum(r.headers.get("Idempotent-Replayed") == "true" for r in responses)
+        check("one claim created", claims == before_claims + 1 and len(ids) == 1, f"ids={ids}")
+        check("debited once", abs(before_balance - balance - 5) < 0.005, f"{before_balance} -> {balance}")
+        check("others replayed or told to retry", replayed + statuses(responses).get(409, 0) == threads - 1,
+              statuses(responses))
+        r = httpx.post(f"{BASE_URL}/api/claim", headers={**salesman, "Idempotency-Key": key}, json={"amount": 6})
+        check("same key, different body rejected", r.status_code == 422, r.status_code)
+
+        print("\n3. Parallel rejects of one pending claim")
+        claim_id = ids.pop()
+        before_balance, _ = snapshot()
+        responses = hammer(threads, lambda c, i: c.post(
+            f"/api/claims/{claim_id}/reject", headers=admin, json={"new_remarks": "stress"}
+        ))
+        balance, _ = snapshot()
+        check("exactly one reject wins", statuses(responses).get(200) == 1, statuses(responses))
+        check("refunded once", abs(balance - before_balance - 5) < 0.005, f"{before_balance} -> {balance}")
+
+        print("\n4. Approve and reject racing on one claim")
+        r = httpx.post(f"{BASE_URL}/api/claim", headers=salesman, json={"amount": 1})
+        claim_id = r.json()["id"]
+        before_balance, _ = snapshot()
+        responses = hammer(threads, lambda c, i: c.post(
+            f"/api/claims/{claim_id}/{'approve' if i % 2 else 'reject'}",
+            headers=admin, json={"new_remarks": "stress"}
+        ))
+        balance, _ = snapshot()
+        check("exactly one decision wins", statuses(responses).get(200) == 1, statuses(responses))
+        check("refund matches decision", balance - before_balance in (0, 1), f"{before_balance} -> {balance}")
+
+        print("\n5. Ledger reconciliation")
+        db = SessionLocal()
+        result = reconcile_wallets(db)
+        db.close()
+        check("balances match ledger", result["mismatched"] == 0, result["mismatches"])
+    finally:
+        server.should_exit = True
+        thread.join()
+
+    print(f"\n{'✅ all checks passed' if not failures else f'❌ {len(failures)} checks failed'}")
+    return not failures
+
+
+if __name__ == "__main__":
+    ok = run_stress(int(sys.argv[1]) if len(sys.argv) > 1 else 40)
+    sys.exit(0 if ok else 1)
@@ -1,4 +1,13 @@
-from datetime import date, timedelta
+from datetime import date, datetime, timedelta
+
+def day_bounds(day: date):
+    """
+    [start, next day start) datetimes for a calendar day. Filter with
+    `col >= start, col < end` instead of func.date(col) == day so an
+    index on the column can be used.
+    """
+    start = datetime.combine(day, datetime.min.time())
+    return start, start + timedelta(days=1)
 
 def get_month_range(today: date):
     start = today.replace(day=1)
@@ -0,0 +1,163 @@
+# backend/utils/export.py
+import csv
+import io
+import os
+from itertools import islice
+from tempfile import NamedTemporaryFile
+from typing import Callable, Iterable, Iterator, Sequence
+
+import pyarrow as pa
+import pyarrow.parquet as pq
+import xlsxwriter
+from fastapi import HTTPException
+from fastapi.responses import FileResponse, StreamingResponse
+from sqlalchemy.orm import Session
+from starlette.background import BackgroundTask
+
+from db.database import SessionLocal
+from services.job_queue import job_file
+
+EXPORT_FORMATS = {
+    "xlsx": "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
+    "csv": "text/csv",
+    "parquet": "application/vnd.apache.parquet",
+}
+
+# Rows fetched from the cursor / written per batch
+FETCH_SIZE = 1000
+
+# A row source opens its query on the given session and yields value tuples
+RowSource = Callable[[Session], Iterable[Sequence]]
+
+# Export columns are (header, python type) pairs; the type fixes the Parquet schema
+Columns = Sequence[tuple[str, type]]
+
+
+def _batches(rows: Iterable[Sequence], size: int) -> Iterator[list]:
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _headers(columns: Columns) -> list[str]:
+    return [name for name, _ in columns]
+
+
+def _write_xlsx(rows, columns, target, sheet_name) -> int:
+    # constant_memory flushes each row to disk as soon as the next one starts
+    workbook = xlsxwriter.Workbook(target, {"constant_memory": True})
+    sheet = workbook.add_worksheet(sheet_name)
+    sheet.write_row(0, 0, _headers(columns))
+    count = 0
+    for count, row in enumerate(rows, start=1):
+        sheet.write_row(count, 0, row)
+    workbook.close()
+    return count
+
+
+def _write_csv(rows, columns, target) -> int:
+    count = 0
+    with open(target, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(_headers(columns))
+        for batch in _batches(rows, FETCH_SIZE):
+            writer.writerows(batch)
+            count += len(batch)
+    return count
+
+
+def _write_parquet(rows, columns, target) -> int:
+    # Declared up front: inferring it from a batch gives an all-None
+    # column the null type, and later batches with values can't be cast to it
+    arrow_types = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    schema = pa.schema([(name, arrow_types[kind]) for name, kind in columns])
+
+    count = 0
+    with pq.ParquetWriter(target, schema) as writer:
+        for batch in _batches(rows, FETCH_SIZE):
+            data = {name: [row[i] for row in batch] for i, (name, _) in enumerate(columns)}
+            writer.write_table(pa.table(data, schema=schema))
+            count += len(batch)
+    return count
+
+
+def write_export(rows: Iterable[Sequence], columns: Columns, fmt: str, target: str, sheet_name: str = "Sheet1") -> int:
+    """
+    Write rows to `target` in the given format without holding them in memory.
+    Returns the number of data rows written.
+    """
+    if fmt == "csv":
+        return _write_csv(rows, columns, target)
+    if fmt == "parquet":
+        return _write_parquet(rows, columns, target)
+    if fmt == "xlsx":
+        return _write_xlsx(rows, columns, target, sheet_name)
+    raise ValueError(f"Unsupported export format: {fmt}")
+
+
+def _csv_stream(source: RowSource, columns: Columns) -> Iterator[bytes]:
+    # The request session is closed once the endpoint returns, so the
+    # stream reads through its own
+    db = SessionLocal()
+    try:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer)
+        writer.writerow(_headers(columns))
+        yield buffer.getvalue().encode("utf-8")
+
+        for batch in _batches(source(db), FETCH_SIZE):
+            buffer.seek(0)
+            buffer.truncate()
+            writer.writerows(batch)
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+def export_response(db: Session, source: RowSource, columns: Columns, fmt: str, filename: str, sheet_name: str = "Sheet1"):
+    """
+    Download response for an export.
+    CSV streams straight from the cursor. XLSX and Parquet can only be sent
+    once complete, so they are built on disk in constant memory and then
+    streamed from the file, which is removed afterwards.
+    """
+    filename = f"{filename}.{fmt}"
+    headers = {"Content-Disposition": f"attachment; filename={filename}"}
+
+    if fmt == "csv":
+        return StreamingResponse(_csv_stream(source, columns), media_type=EXPORT_FORMATS[fmt], headers=headers)
+
+    with NamedTemporaryFile(delete=False, suffix=f".{fmt}") as tmp:
+        path = tmp.name
+    try:
+        write_export(source(db), columns, fmt, path, sheet_name)
+    except ValueError as e:
+        os.remove(path)
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception:
+        os.remove(path)
+        raise
+
+    return FileResponse(
+        path,
+        media_type=EXPORT_FORMATS[fmt],
+        headers=headers,
+        background=BackgroundTask(os.remove, path)
+    )
+
+
+def export_job(source: RowSource, columns: Columns, fmt: str, filename: str, sheet_name: str = "Sheet1"):
+    """
+    Job function for submit_job() that writes the export to a result file.
+    """
+    def run(db: Session, progress) -> dict:
+        path = job_file(f".{fmt}")
+        count = write_export(source(db), columns, fmt, path, sheet_name)
+        return {
+            "file_path": path,
+            "filename": f"{filename}.{fmt}",
+            "media_type": EXPORT_FORMATS[fmt],
+            "rows": count
+        }
+
+    return run
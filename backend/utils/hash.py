@@ -1,10 +1,20 @@
 # backend/utils/hash.py
 from passlib.context import CryptContext
 
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+from config import settings
+
+# Hashes made with another cost factor still verify; verify_and_update()
+# hands back a replacement hash at the configured cost
+pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=settings.BCRYPT_ROUNDS)
 
 def hash_password(password: str) -> str:
     return pwd_context.hash(password)
 
 def verify_password(plain_password: str, hashed_password: str) -> bool:
     return pwd_context.verify(plain_password, hashed_password)
+
+def verify_and_update(plain_password: str, hashed_password: str) -> tuple[bool, str | None]:
+    """
+    Verify, and return a new hash too if the stored one uses an outdated cost.
+    """
+    return pwd_context.verify_and_update(plain_password, hashed_password)
@@ -0,0 +1,34 @@
+# backend/utils/pagination.py
+import base64
+from datetime import datetime
+
+from fastapi import HTTPException
+from sqlalchemy import and_, or_
+
+
+def encode_cursor(timestamp: datetime, row_id: int) -> str:
+    """
+    Opaque keyset cursor for the row a page ended on.
+    """
+    raw = f"{timestamp.isoformat()}|{row_id}"
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def decode_cursor(cursor: str) -> tuple[datetime, int]:
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode()).decode()
+        timestamp, row_id = raw.rsplit("|", 1)
+        return datetime.fromisoformat(timestamp), int(row_id)
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def after_cursor(timestamp_column, id_column, cursor: str):
+    """
+    Keyset predicate for rows after `cursor` in (timestamp desc, id desc) order.
+    """
+    timestamp, row_id = decode_cursor(cursor)
+    return or_(
+        timestamp_column < timestamp,
+        and_(timestamp_column == timestamp, id_column < row_id)
+    )
@@ -7,7 +7,11 @@ from sqlalchemy.orm import Session
 from config import settings
 from utils.hash import verify_password, hash_password
 from crud.salesman_crud import get_salesman_by_mobile
+from sqlalchemy.ext.asyncio import AsyncSession
 from db.database import get_db
+from db.async_database import get_async_db
+from services.principal_cache import principal_cache, cached_principal, remember_principal
+from utils.ttl_cache import MISSING
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="/api/auth/login")
 
@@ -22,6 +26,13 @@ def create_access_token(data: dict, expires_delta: timedelta = None):
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+# ✅ Token claims for a logged-in admin / salesman
+def token_claims(user, role: str, **extra) -> dict:
+    claims = {"sub": user.mobile, "role": role, **extra}
+    if settings.AUTH_TOKEN_VERSION:
+        claims["ver"] = user.token_version or 0
+    return claims
+
 # ✅ Decode token safely
 def decode_access_token(token: str):
     try:
@@ -29,29 +40,44 @@ def decode_access_token(token: str):
     except JWTError:
         return None
 
-# ✅ Admin/Salesman flexible validator
-def get_current_user_role(required_role: str):
-    def role_checker(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
-        payload = decode_access_token(token)
-        if not payload or payload.get("sub") is None or payload.get("role") != required_role:
-            raise HTTPException(status_code=403, detail="Not authorized")
+def _load_user(db: Session, role: str, mobile: str):
+    if role == "admin":
+        from crud.admin_crud import get_admin_by_phone  # lazy import
+        return get_admin_by_phone(db, mobile)
+    return get_salesman_by_mobile(db, mobile)
 
-        mobile = payload["sub"]
+def _check_version(principal, payload: dict):
+    # Tokens issued before the user's token_version was bumped are revoked
+    if "ver" in payload and payload["ver"] < principal.token_version:
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Token has been revoked",
+            headers={"WWW-Authenticate": "Bearer"},
+        )
+    return principal
 
-        if required_role == "admin":
-            from crud.admin_crud import get_admin_by_phone  # lazy import
-            user = get_admin_by_phone(db, mobile)
-        else:
-            user = get_salesman_by_mobile(db, mobile)
+def _principal(db: Session, role: str, payload: dict):
+    principal = cached_principal(role, payload)
+    if principal is MISSING:
+        version = principal_cache.version
+        principal = remember_principal(role, payload["sub"], _load_user(db, role, payload["sub"]), version)
+    return principal
 
-        if not user:
-            raise HTTPException(status_code=404, detail="User not found")
-        return user
+async def _principal_async(db: AsyncSession, role: str, payload: dict):
+    principal = cached_principal(role, payload)
+    if principal is MISSING:
+        version = principal_cache.version
+        user = await db.run_sync(_load_user, role, payload["sub"])
+        principal = remember_principal(role, payload["sub"], user, version)
+    return principal
 
-    return role_checker
+def _role_payload(token: str, required_role: str) -> dict:
+    payload = decode_access_token(token)
+    if not payload or payload.get("sub") is None or payload.get("role") != required_role:
+        raise HTTPException(status_code=403, detail="Not authorized")
+    return payload
 
-# ✅ Explicit function for salesman-only protection
-def get_current_salesman(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+def _salesman_payload(token: str) -> dict:
     payload = decode_access_token(token)
     if not payload or payload.get("sub") is None or payload.get("role") != "salesman":
         raise HTTPException(
@@ -59,8 +85,42 @@ def get_current_salesman(token: str = Depends(oauth2_scheme), db: Session = Depe
             detail="Could not validate credentials",
             headers={"WWW-Authenticate": "Bearer"},
         )
-    mobile = payload["sub"]
-    salesman = get_salesman_by_mobile(db, mobile)
+    return payload
+
+# ✅ Admin/Salesman flexible validator
+# Returns a cached, read-only Principal (see services/principal_cache.py)
+def get_current_user_role(required_role: str):
+    def role_checker(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+        payload = _role_payload(token, required_role)
+        user = _principal(db, required_role, payload)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return _check_version(user, payload)
+
+    return role_checker
+
+# ✅ Same checks for async routes, on the request's AsyncSession
+def get_current_user_role_async(required_role: str):
+    async def role_checker(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+        payload = _role_payload(token, required_role)
+        user = await _principal_async(db, required_role, payload)
+        if not user:
+            raise HTTPException(status_code=404, detail="User not found")
+        return _check_version(user, payload)
+
+    return role_checker
+
+# ✅ Explicit function for salesman-only protection
+def get_current_salesman(token: str = Depends(oauth2_scheme), db: Session = Depends(get_db)):
+    payload = _salesman_payload(token)
+    salesman = _principal(db, "salesman", payload)
+    if not salesman:
+        raise HTTPException(status_code=404, detail="Salesman not found")
+    return _check_version(salesman, payload)
+
+async def get_current_salesman_async(token: str = Depends(oauth2_scheme), db: AsyncSession = Depends(get_async_db)):
+    payload = _salesman_payload(token)
+    salesman = await _principal_async(db, "salesman", payload)
     if not salesman:
         raise HTTPException(status_code=404, detail="Salesman not found")
-    return salesman
+    return _check_version(salesman, payload)
@@ -0,0 +1,80 @@
+# backend/utils/spreadsheet.py
+import os
+import shutil
+from tempfile import NamedTemporaryFile
+from typing import Iterator
+
+import pandas as pd
+from fastapi import UploadFile
+from openpyxl import load_workbook
+
+
+def spool_upload(file: UploadFile) -> str:
+    """
+    Copy an upload to a temp file on disk without reading it into memory.
+    Caller removes the returned path when done.
+    """
+    suffix = os.path.splitext(file.filename or "")[1].lower()
+    with NamedTemporaryFile(delete=False, suffix=suffix) as tmp:
+        shutil.copyfileobj(file.file, tmp)
+        return tmp.name
+
+
+def _is_csv(path: str) -> bool:
+    return path.lower().endswith(".csv")
+
+
+def sheet_columns(path: str) -> list[str]:
+    """
+    Read only the header row of the first sheet (.xlsx) or of a .csv file.
+    """
+    if _is_csv(path):
+        return list(pd.read_csv(path, nrows=0, dtype=str).columns)
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        header = next(wb.worksheets[0].iter_rows(values_only=True), ())
+        return [str(h) for h in header if h is not None]
+    finally:
+        wb.close()
+
+
+def require_columns(path: str, required: set, label: str) -> None:
+    """
+    Raise ValueError unless the sheet header contains every required column.
+    """
+    if not required.issubset(sheet_columns(path)):
+        raise ValueError(f"Invalid file format. Required columns: {label}")
+
+
+def iter_sheet_batches(path: str, batch_size: int) -> Iterator[pd.DataFrame]:
+    """
+    Yield the rows of the first sheet (.xlsx) or .csv file as DataFrames of at
+    most batch_size rows, so memory is bounded by the batch and not the file.
+    CSV cells stay text (barcode "00123" must not become 123); callers
+    convert the numeric columns themselves.
+    """
+    if _is_csv(path):
+        yield from pd.read_csv(path, chunksize=batch_size, dtype=str)
+        return
+
+    wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = wb.worksheets[0].iter_rows(values_only=True)
+        header = [str(h) if h is not None else "" for h in next(rows, ())]
+        batch, index = [], []
+        # Index follows the data row position (as pandas does) so callers can
+        # report sheet row numbers; blank rows are skipped but still counted.
+        for position, row in enumerate(rows):
+            if all(v is None for v in row):
+                continue
+            row = row[:len(header)]
+            batch.append(row + (None,) * (len(header) - len(row)))
+            index.append(position)
+            if len(batch) >= batch_size:
+                yield pd.DataFrame(batch, columns=header, index=index)
+                batch, index = [], []
+        if batch:
+            yield pd.DataFrame(batch, columns=header, index=index)
+    finally:
+        wb.close()
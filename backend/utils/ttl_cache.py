@@ -0,0 +1,76 @@
+# backend/utils/ttl_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+MISSING = object()
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache with a size bound, per-entry TTL and hit/miss counters.
+
+    Every invalidation bumps `version`. A loader that read the DB before an
+    invalidation passes the version it started with to set(), and its now
+    stale value is dropped instead of being cached.
+    Process-local: other workers only see a write once their TTL expires.
+    """
+
+    def __init__(self, max_size: int, ttl: float):
+        self.max_size = max_size
+        self.ttl = ttl
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is None or entry[1] < time.monotonic():
+                if entry is not None:
+                    del self._data[key]
+                self.misses += 1
+                return MISSING
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key, value, version: int = None) -> None:
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            self._data[key] = (value, time.monotonic() + self.ttl)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def get_or_load(self, key, loader):
+        value = self.get(key)
+        if value is MISSING:
+            version = self.version
+            value = loader()
+            self.set(key, value, version)
+        return value
+
+    def invalidate(self, key=MISSING) -> None:
+        with self._lock:
+            self.version += 1
+            if key is MISSING:
+                self._data.clear()
+            else:
+                self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._data),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl,
+                "version": self.version,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else None,
+            }